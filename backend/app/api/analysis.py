@@ -1,10 +1,27 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from beanie import PydanticObjectId
 from pydantic import BaseModel
-from typing import List, Optional
+from contextlib import nullcontext
+from typing import AsyncIterator, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.core.database import insert_many
+from app.core.pagination import paginate
+from app.services.analysis_cache import analysis_cache
+from app.services.context_packer import context_packer
+from app.services.job_queue import JobQueueFull, job_queue
+from app.services.json_stream import JsonSectionParser
 from app.services.llm_service import llm_service
+from app.services.rate_limiter import Priority
+from app.services.trend_snapshots import trend_snapshots
 from app.services.vector_service import vector_service
-from app.models.analysis import SWOTAnalysis, TrendAnalysis, AnalysisType
+from app.models.analysis import (
+    SWOTAnalysis, TrendAnalysis, TrendSnapshot, AnalysisType, SWOTSummary, TrendSummary
+)
 from app.models.document import Document
+import asyncio
+import json
+import numpy as np
 
 router = APIRouter(prefix="/analyze", tags=["analysis"])
 
@@ -22,131 +39,732 @@ class TrendRequest(BaseModel):
     use_rag: bool = True
 
 
-@router.post("/swot", response_model=dict)
-async def generate_swot_analysis(request: SWOTRequest):
-    """Generate SWOT analysis for a company."""
+def _cache_status(cached) -> str:
+    if cached:
+        return "HIT"
+    return "MISS" if analysis_cache.enabled else "BYPASS"
+
+
+def _swot_response(swot: SWOTAnalysis) -> dict:
+    return {
+        "id": str(swot.id),
+        "company_name": swot.company_name,
+        "industry": swot.industry,
+        "analysis": {
+            "strengths": swot.strengths,
+            "weaknesses": swot.weaknesses,
+            "opportunities": swot.opportunities,
+            "threats": swot.threats,
+            "summary": swot.summary,
+            "recommendations": swot.recommendations
+        },
+        "source_documents": swot.source_documents,
+        "context_tokens": swot.context_tokens,
+        "created_at": swot.created_at.isoformat()
+    }
+
+
+def _trend_response(trend: TrendAnalysis) -> dict:
+    return {
+        "id": str(trend.id),
+        "industry": trend.industry,
+        "time_period": trend.time_period,
+        "analysis": {
+            "emerging_trends": trend.emerging_trends,
+            "declining_trends": trend.declining_trends,
+            "summary": trend.summary,
+            "key_insights": trend.key_insights,
+            "predictions": trend.predictions
+        },
+        "source_documents": trend.source_documents,
+        "context_tokens": trend.context_tokens,
+        "created_at": trend.created_at.isoformat()
+    }
+
+
+EMPTY_PACK = {"context": "", "tokens": 0, "passages": [], "dropped": 0}
+
+
+def _swot_query(request: SWOTRequest) -> str:
+    return f"{request.company_name} {request.industry}"
+
+
+def _trend_query(request: TrendRequest) -> str:
+    return f"{request.industry} market trends {request.time_period}"
+
+
+async def _retrieve(
+    query: str,
+    industry: str,
+    embedding: Optional[np.ndarray] = None,
+    priority: Priority = Priority.INTERACTIVE
+) -> List[Dict]:
+    """RAG candidates for a query, reusing its embedding when already computed."""
     
-    try:
-        context = request.context or ""
+    filter_dict = {"industry": industry}
+    if embedding is not None:
+        return await vector_service.search_by_embedding(embedding, settings.RAG_CANDIDATES, filter_dict)
+    return await vector_service.search_similar(
+        query=query,
+        top_k=settings.RAG_CANDIDATES,
+        filter_dict=filter_dict,
+        priority=priority
+    )
+
+
+async def _swot_context(
+    request: SWOTRequest,
+    embedding: Optional[np.ndarray] = None,
+    priority: Priority = Priority.INTERACTIVE
+) -> Dict:
+    """Build the LLM context for a SWOT request."""
+    
+    context = request.context or ""
+    packed = EMPTY_PACK
+    
+    # Use RAG to get relevant context
+    if request.use_rag:
+        similar_docs = await _retrieve(_swot_query(request), request.industry, embedding, priority)
         
-        # Use RAG to get relevant context
-        if request.use_rag:
-            similar_docs = await vector_service.search_similar(
-                query=f"{request.company_name} {request.industry}",
-                top_k=5,
-                filter_dict={"industry": request.industry}
-            )
-            
-            # Combine context from similar documents
-            rag_context = "\n\n".join([
-                doc["metadata"].get("content_preview", "") 
-                for doc in similar_docs
-            ])
-            context = f"{context}\n\n{rag_context}"
+        # Pack the most useful, non-redundant passages into the token budget
+        packed = context_packer.pack(similar_docs)
+        context = f"{context}\n\n{packed['context']}"
+    
+    return {**packed, "context": context}
+
+
+async def _trend_context(
+    request: TrendRequest,
+    embedding: Optional[np.ndarray] = None,
+    priority: Priority = Priority.INTERACTIVE
+) -> Dict:
+    """Build the LLM context for a trend request."""
+    
+    packed = EMPTY_PACK
+    
+    # Use RAG to get relevant context
+    if request.use_rag:
+        similar_docs = await _retrieve(_trend_query(request), request.industry, embedding, priority)
         
-        # Generate SWOT analysis
+        # Pack the most useful, non-redundant passages into the token budget
+        packed = context_packer.pack(similar_docs)
+    
+    return packed
+
+
+def _source_documents(rag: Dict) -> List[str]:
+    """Distinct document IDs behind the packed passages, in priority order."""
+    doc_ids = [passage["metadata"].get("doc_id") for passage in rag["passages"]]
+    return list(dict.fromkeys(doc_id for doc_id in doc_ids if doc_id))
+
+
+def _swot_from_data(
+    request: SWOTRequest,
+    analysis_data: dict,
+    request_hash: str,
+    corpus_version: int,
+    rag: Dict
+) -> SWOTAnalysis:
+    return SWOTAnalysis(
+        company_name=request.company_name,
+        industry=request.industry,
+        strengths=analysis_data["strengths"],
+        weaknesses=analysis_data["weaknesses"],
+        opportunities=analysis_data["opportunities"],
+        threats=analysis_data["threats"],
+        summary=analysis_data["summary"],
+        recommendations=analysis_data.get("recommendations", []),
+        source_documents=_source_documents(rag),
+        context_tokens=rag["tokens"],
+        request_hash=request_hash,
+        corpus_version=corpus_version
+    )
+
+
+def _trend_from_data(
+    request: TrendRequest,
+    analysis_data: dict,
+    request_hash: str,
+    corpus_version: int,
+    rag: Dict
+) -> TrendAnalysis:
+    return TrendAnalysis(
+        industry=request.industry,
+        time_period=request.time_period,
+        emerging_trends=analysis_data["emerging_trends"],
+        declining_trends=analysis_data.get("declining_trends", []),
+        summary=analysis_data["summary"],
+        key_insights=analysis_data["key_insights"],
+        predictions=analysis_data.get("predictions", []),
+        source_documents=_source_documents(rag),
+        context_tokens=rag["tokens"],
+        request_hash=request_hash,
+        corpus_version=corpus_version
+    )
+
+
+def _unlimited(provider: str):
+    return nullcontext()
+
+
+async def _run_swot(
+    request: SWOTRequest,
+    limit: Callable = _unlimited,
+    priority: Priority = Priority.INTERACTIVE
+) -> Tuple[dict, str]:
+    """Produce (or reuse) a SWOT analysis; returns the response and cache status.
+    
+    ``limit(provider)`` wraps each external call so job workers can cap
+    concurrency per provider; queued jobs pass ``Priority.BACKGROUND``.
+    """
+    
+    # Serve a stored analysis if nothing changed since it was produced
+    request_hash = analysis_cache.request_hash("swot", request.model_dump())
+    corpus_version = await analysis_cache.corpus_version(request.industry)
+    cached = await analysis_cache.lookup(SWOTAnalysis, request_hash, corpus_version)
+    if cached:
+        return _swot_response(cached), _cache_status(cached)
+    
+    async with limit("vector"):
+        rag = await _swot_context(request, priority=priority)
+    
+    # Generate SWOT analysis
+    async with limit("openai"):
         analysis_data = await llm_service.generate_swot_analysis(
             company_name=request.company_name,
             industry=request.industry,
-            context=context
+            context=rag["context"],
+            priority=priority
         )
-        
-        # Save to database
-        swot = SWOTAnalysis(
-            company_name=request.company_name,
+    
+    # Save to database
+    swot = _swot_from_data(request, analysis_data, request_hash, corpus_version, rag)
+    await swot.insert()
+    
+    return _swot_response(swot), _cache_status(None)
+
+
+async def _produce_trend(
+    request: TrendRequest,
+    limit: Callable = _unlimited,
+    priority: Priority = Priority.INTERACTIVE
+) -> Tuple[TrendAnalysis, str]:
+    """Produce (or reuse) a trend analysis; returns it and the cache status."""
+    
+    # Serve a stored analysis if nothing changed since it was produced
+    request_hash = analysis_cache.request_hash("trend", request.model_dump())
+    corpus_version = await analysis_cache.corpus_version(request.industry)
+    cached = await analysis_cache.lookup(TrendAnalysis, request_hash, corpus_version)
+    if cached:
+        return cached, _cache_status(cached)
+    
+    async with limit("vector"):
+        rag = await _trend_context(request, priority=priority)
+    
+    # Generate trend analysis
+    async with limit("openai"):
+        analysis_data = await llm_service.analyze_trends(
             industry=request.industry,
-            strengths=analysis_data["strengths"],
-            weaknesses=analysis_data["weaknesses"],
-            opportunities=analysis_data["opportunities"],
-            threats=analysis_data["threats"],
-            summary=analysis_data["summary"],
-            recommendations=analysis_data.get("recommendations", [])
+            context=rag["context"],
+            time_period=request.time_period,
+            priority=priority
         )
-        await swot.insert()
-        
-        return {
-            "id": str(swot.id),
-            "company_name": swot.company_name,
-            "industry": swot.industry,
-            "analysis": {
-                "strengths": swot.strengths,
-                "weaknesses": swot.weaknesses,
-                "opportunities": swot.opportunities,
-                "threats": swot.threats,
-                "summary": swot.summary,
-                "recommendations": swot.recommendations
-            },
-            "created_at": swot.created_at.isoformat()
+    
+    # Save to database
+    trend = _trend_from_data(request, analysis_data, request_hash, corpus_version, rag)
+    await trend.insert()
+    
+    return trend, _cache_status(None)
+
+
+async def _run_trend(
+    request: TrendRequest,
+    limit: Callable = _unlimited,
+    priority: Priority = Priority.INTERACTIVE
+) -> Tuple[dict, str]:
+    """Produce (or reuse) a trend analysis; returns the response and cache status."""
+    trend, cache_status = await _produce_trend(request, limit, priority)
+    return _trend_response(trend), cache_status
+
+
+def _snapshot_response(snapshot: TrendSnapshot, trend: TrendAnalysis) -> dict:
+    return {
+        **_trend_response(trend),
+        "snapshot": {
+            "refreshed_at": snapshot.refreshed_at.isoformat(),
+            "refreshes": snapshot.refreshes
         }
-        
+    }
+
+
+async def _snapshot_trend(request: TrendRequest) -> Tuple[dict, str]:
+    """Serve the industry's trend snapshot, creating it on first request."""
+    
+    found = await trend_snapshots.get(request.industry, request.time_period)
+    if found:
+        return _snapshot_response(*found), "SNAPSHOT"
+    
+    # Documents written while the analysis runs are picked up by the next refresh
+    watermark = await trend_snapshots.watermark(request.industry)
+    trend, cache_status = await _produce_trend(request)
+    snapshot = await trend_snapshots.track(request.industry, request.time_period, trend, watermark)
+    return _snapshot_response(snapshot, trend), cache_status
+
+
+async def _build_trend_snapshot(industry: str, time_period: str) -> TrendAnalysis:
+    """Rebuild a trend snapshot from full RAG context, behind interactive traffic."""
+    
+    request = TrendRequest(industry=industry, time_period=time_period)
+    request_hash = analysis_cache.request_hash("trend", request.model_dump())
+    corpus_version = await analysis_cache.corpus_version(industry)
+    rag = await _trend_context(request, priority=Priority.BACKGROUND)
+    analysis_data = await llm_service.analyze_trends(
+        industry=industry,
+        context=rag["context"],
+        time_period=time_period,
+        priority=Priority.BACKGROUND
+    )
+    return _trend_from_data(request, analysis_data, request_hash, corpus_version, rag)
+
+
+trend_snapshots.register(_build_trend_snapshot)
+
+
+@router.post("/swot", response_model=dict)
+async def generate_swot_analysis(request: SWOTRequest, response: Response):
+    """Generate SWOT analysis for a company."""
+    
+    try:
+        result, cache_status = await _run_swot(request)
+        response.headers["X-Cache"] = cache_status
+        return result
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/trends", response_model=dict)
-async def analyze_market_trends(request: TrendRequest):
-    """Analyze market trends for an industry."""
+async def analyze_market_trends(request: TrendRequest, response: Response, snapshot: bool = False):
+    """Analyze market trends for an industry.
+    
+    With ``snapshot``, the industry's precomputed analysis is served as is
+    (``X-Cache: SNAPSHOT``) and kept current in the background as documents
+    arrive. The first such request computes it.
+    """
     
     try:
-        context = ""
+        if snapshot and request.use_rag:
+            result, cache_status = await _snapshot_trend(request)
+        else:
+            result, cache_status = await _run_trend(request)
+        response.headers["X-Cache"] = cache_status
+        return result
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _swot_job(payload: Dict) -> Dict:
+    result, _ = await _run_swot(SWOTRequest(**payload), limit=job_queue.limit, priority=Priority.BACKGROUND)
+    return result
+
+
+async def _trend_job(payload: Dict) -> Dict:
+    result, _ = await _run_trend(TrendRequest(**payload), limit=job_queue.limit, priority=Priority.BACKGROUND)
+    return result
+
+
+job_queue.register("swot", _swot_job)
+job_queue.register("trend", _trend_job)
+
+
+def _job_response(job: Dict) -> dict:
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"].isoformat(),
+        "started_at": job["started_at"].isoformat() if job["started_at"] else None,
+        "finished_at": job["finished_at"].isoformat() if job["finished_at"] else None
+    }
+
+
+async def _submit_job(kind: str, request: BaseModel) -> dict:
+    try:
+        job = await job_queue.submit(kind, request.model_dump())
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"job_id": job["id"], "status": job["status"]}
+
+
+@router.post("/swot/jobs", response_model=dict, status_code=202)
+async def submit_swot_job(request: SWOTRequest):
+    """Queue a SWOT analysis; poll ``/analyze/jobs/{job_id}`` for the result."""
+    return await _submit_job("swot", request)
+
+
+@router.post("/trends/jobs", response_model=dict, status_code=202)
+async def submit_trend_job(request: TrendRequest):
+    """Queue a market trend analysis; poll ``/analyze/jobs/{job_id}`` for the result."""
+    return await _submit_job("trend", request)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status and, once finished, the result of an analysis job."""
+    
+    try:
+        job = await job_queue.get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return _job_response(job)
+
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_events(
+    cached,
+    to_response: Callable,
+    build_context: Callable,
+    stream_tokens: Callable,
+    build_analysis: Callable
+) -> AsyncIterator[str]:
+    """Stream an analysis as SSE: start, context, delta/section events, then done.
+    
+    ``delta`` events carry raw model text; ``section`` events carry each
+    top-level field (strengths, emerging_trends, ...) once it is complete.
+    The final document is stored before ``done`` is sent.
+    """
+    
+    try:
+        yield _sse("start", {"cache": _cache_status(cached)})
         
-        # Use RAG to get relevant context
-        if request.use_rag:
-            similar_docs = await vector_service.search_similar(
-                query=f"{request.industry} market trends {request.time_period}",
-                top_k=10,
-                filter_dict={"industry": request.industry}
-            )
-            
-            context = "\n\n".join([
-                doc["metadata"].get("content_preview", "") 
-                for doc in similar_docs
-            ])
+        if cached:
+            payload = to_response(cached)
+            for key, value in payload["analysis"].items():
+                yield _sse("section", {"key": key, "value": value})
+            yield _sse("done", payload)
+            return
         
-        # Generate trend analysis
-        analysis_data = await llm_service.analyze_trends(
+        rag = await build_context()
+        yield _sse("context", {"tokens": rag["tokens"], "passages": len(rag["passages"])})
+        parser = JsonSectionParser()
+        
+        async for fragment in stream_tokens(rag["context"]):
+            yield _sse("delta", {"text": fragment})
+            for key, value in parser.feed(fragment):
+                yield _sse("section", {"key": key, "value": value})
+        
+        # Save to database once the full document has arrived
+        analysis = build_analysis(parser.result(), rag)
+        await analysis.insert()
+        
+        yield _sse("done", to_response(analysis))
+    
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("/swot/stream")
+async def stream_swot_analysis(request: SWOTRequest):
+    """Stream a SWOT analysis as Server-Sent Events."""
+    
+    try:
+        request_hash = analysis_cache.request_hash("swot", request.model_dump())
+        corpus_version = await analysis_cache.corpus_version(request.industry)
+        cached = await analysis_cache.lookup(SWOTAnalysis, request_hash, corpus_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    events = _stream_events(
+        cached,
+        to_response=_swot_response,
+        build_context=lambda: _swot_context(request),
+        stream_tokens=lambda context: llm_service.stream_swot_analysis(
+            company_name=request.company_name,
+            industry=request.industry,
+            context=context
+        ),
+        build_analysis=lambda data, rag: _swot_from_data(request, data, request_hash, corpus_version, rag)
+    )
+    headers = {**SSE_HEADERS, "X-Cache": _cache_status(cached)}
+    return StreamingResponse(events, media_type="text/event-stream", headers=headers)
+
+
+@router.post("/trends/stream")
+async def stream_market_trends(request: TrendRequest):
+    """Stream a market trend analysis as Server-Sent Events."""
+    
+    try:
+        request_hash = analysis_cache.request_hash("trend", request.model_dump())
+        corpus_version = await analysis_cache.corpus_version(request.industry)
+        cached = await analysis_cache.lookup(TrendAnalysis, request_hash, corpus_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    events = _stream_events(
+        cached,
+        to_response=_trend_response,
+        build_context=lambda: _trend_context(request),
+        stream_tokens=lambda context: llm_service.stream_trends(
             industry=request.industry,
             context=context,
             time_period=request.time_period
-        )
-        
-        # Save to database
-        trend = TrendAnalysis(
+        ),
+        build_analysis=lambda data, rag: _trend_from_data(request, data, request_hash, corpus_version, rag)
+    )
+    headers = {**SSE_HEADERS, "X-Cache": _cache_status(cached)}
+    return StreamingResponse(events, media_type="text/event-stream", headers=headers)
+
+
+class BatchAnalysisRequest(BaseModel):
+    swot: List[SWOTRequest] = []
+    trends: List[TrendRequest] = []
+
+
+class BatchKind(NamedTuple):
+    """How one analysis type runs inside a batch."""
+    model: type
+    cache_kind: str
+    query: Callable
+    build_context: Callable
+    generate: Callable
+    from_data: Callable
+    to_response: Callable
+
+
+BATCH_KINDS = {
+    "swot": BatchKind(
+        model=SWOTAnalysis,
+        cache_kind="swot",
+        query=_swot_query,
+        build_context=_swot_context,
+        generate=lambda request, context: llm_service.generate_swot_analysis(
+            company_name=request.company_name,
+            industry=request.industry,
+            context=context,
+            priority=Priority.BACKGROUND
+        ),
+        from_data=_swot_from_data,
+        to_response=_swot_response
+    ),
+    "trends": BatchKind(
+        model=TrendAnalysis,
+        cache_kind="trend",
+        query=_trend_query,
+        build_context=_trend_context,
+        generate=lambda request, context: llm_service.analyze_trends(
             industry=request.industry,
+            context=context,
             time_period=request.time_period,
-            emerging_trends=analysis_data["emerging_trends"],
-            declining_trends=analysis_data.get("declining_trends", []),
-            summary=analysis_data["summary"],
-            key_insights=analysis_data["key_insights"],
-            predictions=analysis_data.get("predictions", [])
-        )
-        await trend.insert()
+            priority=Priority.BACKGROUND
+        ),
+        from_data=_trend_from_data,
+        to_response=_trend_response
+    )
+}
+
+
+async def _run_batch(items: List[Tuple[str, int, BaseModel]], emit: Callable[[Dict], None]):
+    """Run a batch of analyses, emitting each item's result as it finishes.
+    
+    Cached analyses are emitted first and identical items share one run.
+    All RAG queries are embedded in one batched call, vector searches run
+    concurrently, and completions fan out under ``BATCH_LLM_CONCURRENCY``
+    at background priority. New analyses are emitted once stored: each
+    analysis type has at most one ``insert_many`` in flight, and analyses
+    finishing meanwhile go into the next one, so results trail generation
+    by about one round-trip. An item whose insert is rejected is failed.
+    """
+    
+    counts = {"succeeded": 0, "cached": 0, "failed": 0}
+    
+    def finish(group: Dict, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        for index in group["indexes"]:
+            counts[status] += 1
+            emit({"kind": group["kind"], "index": index, "status": status, "result": result, "error": error})
+    
+    try:
+        # Identical requests share a cache key, so run each only once
+        groups: Dict[Tuple[str, str], Dict] = {}
+        for kind, index, request in items:
+            request_hash = analysis_cache.request_hash(BATCH_KINDS[kind].cache_kind, request.model_dump())
+            group = groups.setdefault(
+                (kind, request_hash),
+                {"kind": kind, "request": request, "hash": request_hash, "indexes": []}
+            )
+            group["indexes"].append(index)
         
-        return {
-            "id": str(trend.id),
-            "industry": trend.industry,
-            "time_period": trend.time_period,
-            "analysis": {
-                "emerging_trends": trend.emerging_trends,
-                "declining_trends": trend.declining_trends,
-                "summary": trend.summary,
-                "key_insights": trend.key_insights,
-                "predictions": trend.predictions
-            },
-            "created_at": trend.created_at.isoformat()
-        }
+        industries = list({group["request"].industry for group in groups.values()})
+        versions = dict(zip(industries, await asyncio.gather(*[
+            analysis_cache.corpus_version(industry) for industry in industries
+        ])))
+        hits = await asyncio.gather(*[
+            analysis_cache.lookup(
+                BATCH_KINDS[group["kind"]].model, group["hash"], versions[group["request"].industry]
+            )
+            for group in groups.values()
+        ])
+        
+        pending = []
+        for group, hit in zip(groups.values(), hits):
+            if hit:
+                finish(group, "cached", BATCH_KINDS[group["kind"]].to_response(hit))
+            else:
+                pending.append(group)
         
+        # One batched embedding call covers every RAG query in the batch
+        rag_groups = [group for group in pending if group["request"].use_rag]
+        if rag_groups:
+            try:
+                embeddings = await llm_service.generate_embeddings(
+                    [BATCH_KINDS[group["kind"]].query(group["request"]) for group in rag_groups],
+                    priority=Priority.BACKGROUND
+                )
+            except Exception as e:
+                for group in rag_groups:
+                    finish(group, "failed", error=f"embedding failed: {e}")
+                pending = [group for group in pending if not group["request"].use_rag]
+            else:
+                for group, embedding in zip(rag_groups, embeddings):
+                    group["embedding"] = embedding
+        
+        llm_slots = asyncio.Semaphore(settings.BATCH_LLM_CONCURRENCY)
+        unstored: Dict[str, List[Tuple[Dict, BaseModel]]] = {kind: [] for kind in BATCH_KINDS}
+        storing = set()
+        stored = 0
+        
+        async def store(kind: str):
+            """Insert ``kind``'s finished analyses until none are waiting."""
+            nonlocal stored
+            if kind in storing:
+                # The running insert loop picks these up next
+                return
+            storing.add(kind)
+            spec = BATCH_KINDS[kind]
+            try:
+                while unstored[kind]:
+                    results, unstored[kind] = unstored[kind], []
+                    try:
+                        errors = await insert_many(spec.model, [analysis for _, analysis in results])
+                    except Exception as e:
+                        errors = {position: str(e) for position in range(len(results))}
+                    stored += len(results) - len(errors)
+                    for position, (group, analysis) in enumerate(results):
+                        if position in errors:
+                            finish(group, "failed", error=f"storing failed: {errors[position]}")
+                        else:
+                            finish(group, "succeeded", spec.to_response(analysis))
+            finally:
+                storing.discard(kind)
+        
+        async def run(group: Dict):
+            spec = BATCH_KINDS[group["kind"]]
+            request = group["request"]
+            try:
+                rag = await spec.build_context(request, group.get("embedding"))
+                async with llm_slots:
+                    analysis_data = await spec.generate(request, rag["context"])
+                analysis = spec.from_data(
+                    request, analysis_data, group["hash"], versions[request.industry], rag
+                )
+                analysis.id = PydanticObjectId()
+            except Exception as e:
+                finish(group, "failed", error=str(e))
+                return
+            unstored[group["kind"]].append((group, analysis))
+            await store(group["kind"])
+        
+        await asyncio.gather(*[run(group) for group in pending])
+        
+        emit({"done": True, **counts, "stored": stored})
+    
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        emit({"done": True, **counts, "error": str(e)})
+
+
+# Running batches; referenced so they finish even if the client disconnects
+_batches = set()
+
+
+async def _batch_lines(items: List[Tuple[str, int, BaseModel]]) -> AsyncIterator[str]:
+    """NDJSON lines from a batch running in its own task."""
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_batch(items, queue.put_nowait))
+    _batches.add(task)
+    task.add_done_callback(_batches.discard)
+    
+    while True:
+        line = await queue.get()
+        yield json.dumps(line, default=str) + "\n"
+        if line.get("done"):
+            return
+
+
+@router.post("/batch")
+async def batch_analysis(request: BatchAnalysisRequest):
+    """Run many SWOT and trend analyses in one call, streaming results as NDJSON.
+    
+    Each line is ``{"kind", "index", "status", "result", "error"}`` for one
+    item, in completion order; ``index`` is its position in ``swot`` or
+    ``trends`` and ``status`` is ``succeeded``, ``cached`` or ``failed``.
+    The last line is ``{"done": true, ...}`` with counts, sent once new
+    analyses are stored. A batch still completes and is stored if the client
+    disconnects, so a retry is served from the analysis cache.
+    """
+    
+    items = (
+        [("swot", index, item) for index, item in enumerate(request.swot)]
+        + [("trends", index, item) for index, item in enumerate(request.trends)]
+    )
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {len(items)} items; the limit is {settings.BATCH_MAX_ITEMS}"
+        )
+    
+    return StreamingResponse(_batch_lines(items), media_type="application/x-ndjson", headers=SSE_HEADERS)
 
 
 @router.get("/history/{analysis_type}")
-async def get_analysis_history(analysis_type: str, limit: int = 10):
-    """Get historical analyses."""
+async def get_analysis_history(
+    analysis_type: str,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc"
+):
+    """Get historical analyses, newest first by default.
+    
+    When more results exist, the ``X-Next-Cursor`` response header holds the
+    ``cursor`` for the next page.
+    """
     
     try:
         if analysis_type == "swot":
-            analyses = await SWOTAnalysis.find().limit(limit).to_list()
+            analyses, next_cursor = await paginate(
+                SWOTAnalysis, {}, SWOTSummary, limit=limit, cursor=cursor, descending=order == "desc"
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
             return [
                 {
                     "id": str(a.id),
@@ -157,7 +775,11 @@ async def get_analysis_history(analysis_type: str, limit: int = 10):
                 for a in analyses
             ]
         elif analysis_type == "trend":
-            analyses = await TrendAnalysis.find().limit(limit).to_list()
+            analyses, next_cursor = await paginate(
+                TrendAnalysis, {}, TrendSummary, limit=limit, cursor=cursor, descending=order == "desc"
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
             return [
                 {
                     "id": str(a.id),
@@ -169,6 +791,10 @@ async def get_analysis_history(analysis_type: str, limit: int = 10):
             ]
         else:
             raise HTTPException(status_code=400, detail="Invalid analysis type")
-            
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
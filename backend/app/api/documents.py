@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional
-from app.models.document import Document
-from app.services.vector_service import vector_service
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ValidationError
+from typing import AsyncIterator, List, Literal, Optional
+from app.core.config import settings
+from app.core.pagination import paginate
+from app.models.document import Document, DocumentSummary
+from app.services.ingestion_service import ingestion_service
+from app.services.search_service import LexicalIndexUnavailable, search_service
+import json
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -17,46 +21,132 @@ class DocumentCreate(BaseModel):
     metadata: dict = {}
 
 
+INGEST_MESSAGES = {
+    "ingested": "Document ingested successfully",
+    "updated": "Document updated successfully",
+    "unchanged": "Document unchanged, nothing to do"
+}
+
+
 @router.post("/ingest", response_model=dict)
-async def ingest_document(doc: DocumentCreate):
-    """Ingest a new document and create vector embeddings."""
+async def ingest_document(doc: DocumentCreate, upsert: bool = False):
+    """Ingest a new document and create vector embeddings.
+    
+    With ``upsert``, a document with the same source and url is updated in
+    place, or left alone if its content is unchanged.
+    """
     
     try:
-        # Create document in MongoDB
-        document = Document(
-            title=doc.title,
-            content=doc.content,
-            source=doc.source,
-            url=doc.url,
-            category=doc.category,
-            industry=doc.industry,
-            metadata=doc.metadata
-        )
-        await document.insert()
+        results = await ingestion_service.ingest_documents([doc.model_dump()], upsert=upsert)
+        result = results[0]
+        if result["status"] == "failed":
+            raise HTTPException(status_code=500, detail=result["error"])
         
-        # Store embedding in vector database
-        vector_id = await vector_service.upsert_document(
-            doc_id=str(document.id),
-            content=doc.content,
-            metadata={
-                "title": doc.title,
-                "source": doc.source,
-                "category": doc.category,
-                "industry": doc.industry
-            }
+        return {
+            "id": result["id"],
+            "title": result["title"],
+            "embedding_id": result["embedding_id"],
+            "status": result["status"],
+            "message": INGEST_MESSAGES[result["status"]]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """Yield non-empty lines from a streamed NDJSON request body."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def _iter_bulk_items(request: Request) -> AsyncIterator[object]:
+    """Yield raw items from a JSON array or NDJSON request body."""
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith(NDJSON_CONTENT_TYPES):
+        async for line in _iter_ndjson(request):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield e
+        return
+    
+    items = await request.json()
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of documents")
+    for item in items:
+        yield item
+
+
+@router.post("/ingest/bulk", response_model=dict)
+async def ingest_documents_bulk(request: Request, upsert: bool = False):
+    """Ingest a batch of documents sent as a JSON array or NDJSON stream.
+    
+    ``upsert`` works as for ``/ingest``; each result's ``status`` is one of
+    ``ingested``, ``updated``, ``unchanged``, ``skipped`` or ``failed``.
+    """
+    
+    results: List[dict] = []
+    pending: List[tuple] = []  # (input index, validated payload)
+    
+    async def flush():
+        batch_results = await ingestion_service.ingest_documents(
+            [payload for _, payload in pending],
+            upsert=upsert
         )
+        for (index, _), result in zip(pending, batch_results):
+            results.append({"index": index, **result})
+        pending.clear()
+    
+    try:
+        index = 0
+        async for item in _iter_bulk_items(request):
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                pending.append((index, DocumentCreate.model_validate(item).model_dump()))
+            except (ValidationError, json.JSONDecodeError) as e:
+                results.append({
+                    "index": index,
+                    "id": None,
+                    "title": item.get("title") if isinstance(item, dict) else None,
+                    "embedding_id": None,
+                    "status": "failed",
+                    "error": str(e)
+                })
+            index += 1
+            
+            if len(pending) >= settings.INGEST_BATCH_SIZE:
+                await flush()
+        
+        if pending:
+            await flush()
         
-        # Update document with embedding ID
-        document.embedding_id = vector_id
-        await document.save()
+        results.sort(key=lambda result: result["index"])
+        failed = sum(1 for result in results if result["status"] == "failed")
         
         return {
-            "id": str(document.id),
-            "title": document.title,
-            "embedding_id": vector_id,
-            "message": "Document ingested successfully"
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -87,21 +177,37 @@ async def get_document(document_id: str):
 
 @router.get("/")
 async def list_documents(
+    response: Response,
     industry: Optional[str] = None,
     category: Optional[str] = None,
-    limit: int = 20
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc"
 ):
-    """List documents with optional filters."""
+    """List documents with optional filters, newest first by default.
+    
+    When more results exist, the ``X-Next-Cursor`` response header holds the
+    ``cursor`` for the next page.
+    """
     
     try:
-        query = Document.find()
-        
+        filters = {}
         if industry:
-            query = query.find(Document.industry == industry)
+            filters["industry"] = industry
         if category:
-            query = query.find(Document.category == category)
+            filters["category"] = category
         
-        documents = await query.limit(limit).to_list()
+        # Keyset page fetching only the listed fields
+        documents, next_cursor = await paginate(
+            Document,
+            filters,
+            DocumentSummary,
+            limit=limit,
+            cursor=cursor,
+            descending=order == "desc"
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         return [
             {
@@ -115,27 +221,43 @@ async def list_documents(
             for doc in documents
         ]
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/search")
-async def semantic_search(query: str, industry: Optional[str] = None, top_k: int = 5):
-    """Perform semantic search across documents."""
+async def semantic_search(
+    query: str,
+    industry: Optional[str] = None,
+    top_k: int = 5,
+    mode: Literal["semantic", "lexical", "hybrid"] = "semantic"
+):
+    """Search documents by meaning, keywords, or both.
+    
+    ``lexical`` ranks by BM25 over titles and content without calling the
+    embedding API, which suits tickers, names and product codes. ``hybrid``
+    fuses the lexical and semantic rankings.
+    """
     
     try:
         filter_dict = {"industry": industry} if industry else None
         
-        results = await vector_service.search_similar(
+        results = await search_service.search(
             query=query,
             top_k=top_k,
-            filter_dict=filter_dict
+            filter_dict=filter_dict,
+            mode=mode
         )
         
         return {
             "query": query,
+            "mode": mode,
             "results": results
         }
         
+    except LexicalIndexUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
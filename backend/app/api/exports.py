@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Literal, Optional
+from app.models.analysis import Analysis, SWOTAnalysis, TrendAnalysis
+from app.models.document import Document
+from app.services.export_service import export_filters, export_service
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+EXPORT_MODELS = {
+    "documents": Document,
+    "swot": SWOTAnalysis,
+    "trends": TrendAnalysis,
+    "analyses": Analysis
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: Literal["documents", "swot", "trends", "analyses"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    industry: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gzip: bool = False
+):
+    """Stream every matching record as NDJSON or CSV, oldest first.
+    
+    ``since`` (inclusive) and ``until`` (exclusive) bound ``created_at``;
+    ``category`` applies to documents only. With ``gzip`` the body is a
+    ``.gz`` file. Rows are sent as they are read, so dumps of any size use
+    constant memory.
+    """
+    
+    if category and collection != "documents":
+        raise HTTPException(status_code=400, detail="category only applies to documents")
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    
+    filters = export_filters(industry, category, since, until)
+    body = export_service.stream(EXPORT_MODELS[collection], filters, format, compress=gzip)
+    
+    filename = f"{collection}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
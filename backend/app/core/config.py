@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,15 +14,116 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4-turbo-preview"
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_BATCH_SIZE: int = 256  # Inputs per embeddings request (API max 2048)
+    EMBEDDING_CACHE_SIZE: int = 5000  # In-memory LRU entries; 0 disables the tier
+    EMBEDDING_CACHE_PATH: Optional[str] = None  # SQLite file for a persistent tier
+    EMBEDDING_CACHE_QUANTIZATION: str = "none"  # "none" or "int8" (4x smaller cache entries)
+    
+    # OpenAI rate limits (set to your account's tier)
+    OPENAI_CHAT_RPM: int = 500
+    OPENAI_CHAT_TPM: int = 30000
+    OPENAI_EMBEDDING_RPM: int = 3000
+    OPENAI_EMBEDDING_TPM: int = 1000000
+    OPENAI_MAX_CONCURRENCY: int = 16  # In-flight requests per quota
+    OPENAI_MAX_RETRIES: int = 5  # Retries on 429, 5xx and connection errors
+    OPENAI_BACKOFF_BASE_SECONDS: float = 0.5
+    OPENAI_BACKOFF_MAX_SECONDS: float = 30.0
+    OPENAI_COMPLETION_TOKENS_ESTIMATE: int = 1000  # Assumed output size when max_tokens is unset
+    
+    # Vector store
+    VECTOR_BACKEND: str = "pinecone"  # "pinecone" or "faiss"
+    EMBEDDING_DIMENSION: int = 1536  # OpenAI ada-002 embedding dimension
+    VECTOR_MAX_CONCURRENCY: int = 8  # Worker threads for blocking store calls
+    VECTOR_TIMEOUT_SECONDS: float = 10.0  # Per-call timeout, including queueing
+    VECTOR_UPSERT_BATCH_SIZE: int = 100  # Vectors per upsert request
+    VECTOR_FETCH_BATCH_SIZE: int = 200  # IDs per fetch call (Pinecone puts them in the URL)
+    CHUNK_SIZE_TOKENS: int = 512  # Tokens per embedded chunk
+    CHUNK_OVERLAP_TOKENS: int = 64  # Tokens shared between neighbouring chunks
+    
+    # Semantic query cache (near-duplicate searches skip the vector store)
+    QUERY_CACHE_SIZE: int = 1000  # Cached searches per process; 0 disables
+    QUERY_CACHE_THRESHOLD: float = 0.95  # Min cosine similarity to reuse a cached search
+    QUERY_CACHE_TTL_SECONDS: int = 300  # Bounds staleness from other processes' writes
     
     # Pinecone
-    PINECONE_API_KEY: str
-    PINECONE_ENVIRONMENT: str
+    PINECONE_API_KEY: Optional[str] = None
+    PINECONE_ENVIRONMENT: Optional[str] = None
     PINECONE_INDEX_NAME: str = "market-intelligence"
     
+    # FAISS (local vector store)
+    FAISS_INDEX_TYPE: str = "flat"  # "flat", "ivf" or "hnsw"
+    FAISS_INDEX_PATH: Optional[str] = None  # Prefix for the vectors file, write log and checkpoints; None keeps it in memory
+    FAISS_NLIST: int = 100  # IVF clusters
+    FAISS_NPROBE: int = 8  # IVF clusters scanned per query
+    FAISS_HNSW_M: int = 32  # HNSW graph degree
+    FAISS_EF_SEARCH: int = 64  # HNSW search breadth
+    FAISS_QUANTIZATION: str = "none"  # "none", "sq8" (4x smaller) or "pq" (ivf only)
+    FAISS_PQ_M: int = 192  # PQ bytes per vector; must divide EMBEDDING_DIMENSION
+    FAISS_CHECKPOINT_VECTORS: int = 50000  # Checkpoint the index after this many logged writes
+    
+    # RAG context packing
+    RAG_CANDIDATES: int = 20  # Passages retrieved before packing
+    RAG_CONTEXT_TOKENS: int = 3000  # Token budget for retrieved context
+    RAG_PASSAGE_MAX_TOKENS: int = 600  # Longer passages are trimmed
+    RAG_MMR_LAMBDA: float = 0.7  # 1.0 ranks purely by relevance, lower favours diversity
+    RAG_DUPLICATE_THRESHOLD: float = 0.8  # Bigram overlap at which passages count as duplicates
+    
+    # Keyword search (BM25)
+    LEXICAL_INDEX_ENABLED: bool = True  # In-memory inverted index for lexical and hybrid search
+    LEXICAL_REFRESH_SECONDS: int = 30  # Pick up documents written by other processes; 0 loads once
+    LEXICAL_TITLE_WEIGHT: float = 2.0  # Title terms count this many times
+    BM25_K1: float = 1.2  # Term-frequency saturation
+    BM25_B: float = 0.75  # Document-length normalization
+    HYBRID_RRF_K: int = 60  # Reciprocal rank fusion constant; higher flattens rank differences
+    HYBRID_CANDIDATES: int = 50  # Results fetched from each ranker before fusion
+    
+    # Ingestion
+    INGEST_BATCH_SIZE: int = 500  # Documents per bulk ingest round
+    
+    # Analysis response cache
+    ANALYSIS_CACHE_TTL_SECONDS: int = 3600  # 0 disables reuse of stored analyses
+    
+    # Metrics
+    METRICS_ENABLED: bool = True  # Prometheus /metrics and stage timings
+    
+    # Batch analysis (POST /api/analyze/batch)
+    BATCH_MAX_ITEMS: int = 500  # SWOT plus trend items per request
+    BATCH_LLM_CONCURRENCY: int = 16  # Completions in flight per batch; the rate limiter still paces them
+    
+    # Background analysis jobs
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 1000  # Submissions beyond this are rejected with 503
+    JOB_LEASE_SECONDS: int = 1800  # Running jobs older than this are requeued on start
+    JOB_OPENAI_CONCURRENCY: int = 4  # Concurrent LLM calls across all workers
+    JOB_VECTOR_CONCURRENCY: int = 8  # Concurrent vector searches across all workers
+    
+    # Exports (/export/{collection})
+    EXPORT_BATCH_SIZE: int = 1000  # Documents fetched per cursor round-trip
+    EXPORT_GZIP_LEVEL: int = 6  # 1 (fastest) to 9 (smallest)
+    
+    # Trend snapshots (/analyze/trends?snapshot=true), refreshed in the background
+    TREND_SNAPSHOT_INTERVAL_SECONDS: int = 60  # How often snapshots are checked; 0 disables refreshes
+    TREND_SNAPSHOT_MIN_NEW_DOCUMENTS: int = 10  # New documents that trigger a refresh
+    TREND_SNAPSHOT_MAX_AGE_SECONDS: int = 21600  # Fewer new documents are folded in after this long
+    TREND_SNAPSHOT_DELTA_DOCUMENTS: int = 50  # More new documents than this rebuild from scratch
+    TREND_SNAPSHOT_LEASE_SECONDS: int = 300  # How long one worker owns a refresh
+    
+    # Startup (dependencies connect in the background; see GET /ready)
+    STARTUP_RETRY_BASE_SECONDS: float = 1.0  # First retry delay after a failed connection
+    STARTUP_RETRY_MAX_SECONDS: float = 30.0  # Backoff cap
+    
     # MongoDB
     MONGODB_URL: str
     DATABASE_NAME: str
+    MONGO_MAX_POOL_SIZE: int = 100  # Connections per process
+    MONGO_MIN_POOL_SIZE: int = 10  # Kept open so write bursts don't pay for new connections
+    MONGO_MAX_IDLE_TIME_MS: int = 300000  # Idle connections above the minimum close after this
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10000  # Max wait for a free pooled connection
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000  # Fail fast; startup retries in the background
+    MONGO_SOCKET_TIMEOUT_MS: int = 30000
+    MONGO_COMPRESSORS: str = ""  # e.g. "zstd,zlib"; wire compression for large documents
     
     # Security
     SECRET_KEY: str
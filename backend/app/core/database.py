@@ -1,8 +1,15 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
+from beanie import Document as BeanieDocument, init_beanie
+from beanie.odm.utils.dump import get_dict
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from typing import Dict, Iterable, List, Type
 from app.core.config import settings
+from app.core.metrics import MongoCommandMetrics, MongoPoolMetrics
 from app.models.document import Document
-from app.models.analysis import Analysis
+from app.models.analysis import Analysis, SWOTAnalysis, TrendAnalysis, TrendSnapshot
+from app.models.corpus import CorpusVersion
+from app.models.job import AnalysisJob
 
 
 class Database:
@@ -12,17 +19,80 @@ class Database:
 db = Database()
 
 
+def client_options() -> Dict:
+    """Pool, timeout and compression options for the MongoDB client."""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS
+    }
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    if settings.METRICS_ENABLED:
+        options["event_listeners"] = [MongoCommandMetrics(), MongoPoolMetrics()]
+    return options
+
+
 async def connect_to_mongo():
     """Connect to MongoDB and initialize Beanie ODM."""
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
-    await init_beanie(
-        database=db.client[settings.DATABASE_NAME],
-        document_models=[Document, Analysis]
-    )
+    client = AsyncIOMotorClient(settings.MONGODB_URL, **client_options())
+    try:
+        await init_beanie(
+            database=client[settings.DATABASE_NAME],
+            document_models=[
+                Document,
+                Analysis,
+                SWOTAnalysis,
+                TrendAnalysis,
+                TrendSnapshot,
+                CorpusVersion,
+                AnalysisJob
+            ]
+        )
+    except BaseException:
+        # Don't leak a client per failed attempt when startup retries
+        client.close()
+        raise
+    db.client = client
     print("✅ Connected to MongoDB")
 
 
 async def close_mongo_connection():
     """Close MongoDB connection."""
+    if db.client is None:
+        return
     db.client.close()
+    db.client = None
     print("❌ Closed MongoDB connection")
+
+
+def insert_one(document: BeanieDocument) -> InsertOne:
+    """Bulk insert operation for a Beanie document, serialized as ``insert()`` would."""
+    return InsertOne(get_dict(document, to_db=True, keep_nulls=document.get_settings().keep_nulls))
+
+
+async def bulk_write(model: Type[BeanieDocument], operations: List) -> Dict[int, str]:
+    """Run write operations on ``model``'s collection in one unordered bulk write.
+
+    The driver splits oversized batches itself. A failed operation doesn't
+    stop the others; returns error messages by operation index.
+    """
+    if not operations:
+        return {}
+    try:
+        await model.get_motor_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        return {
+            error["index"]: error.get("errmsg", "write failed")
+            for error in e.details.get("writeErrors", [])
+        }
+    return {}
+
+
+async def insert_many(model: Type[BeanieDocument], documents: Iterable[BeanieDocument]) -> Dict[int, str]:
+    """Insert documents in one unordered bulk write; returns errors by position."""
+    return await bulk_write(model, [insert_one(document) for document in documents])
@@ -0,0 +1,283 @@
+from contextlib import nullcontext
+from functools import wraps
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+from typing import Dict, Tuple
+import inspect
+import threading
+import time
+from app.core.config import settings
+
+# Spans sub-millisecond cache hits up to long LLM completions
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+STAGE_SECONDS = Histogram(
+    "market_intel_stage_seconds",
+    "Time spent in one pipeline stage",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "market_intel_stage_errors_total",
+    "Pipeline stage calls that raised",
+    ["stage"]
+)
+STAGE_IN_FLIGHT = Gauge(
+    "market_intel_stage_in_flight",
+    "Pipeline stage calls currently running",
+    ["stage"]
+)
+HTTP_SECONDS = Histogram(
+    "market_intel_http_request_seconds",
+    "HTTP request latency until the response starts",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "market_intel_http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+MONGO_SECONDS = Histogram(
+    "market_intel_mongo_command_seconds",
+    "MongoDB command latency",
+    ["command", "collection", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+MONGO_CONNECTIONS = Counter(
+    "market_intel_mongo_connections_total",
+    "MongoDB pool connection events; a rising created count is connection churn",
+    ["event"]
+)
+MONGO_CONNECTIONS_OPEN = Gauge(
+    "market_intel_mongo_connections_open",
+    "Open MongoDB pool connections"
+)
+MONGO_CONNECTIONS_IN_USE = Gauge(
+    "market_intel_mongo_connections_in_use",
+    "MongoDB pool connections checked out by operations"
+)
+QUERY_CACHE_SIMILARITY = Histogram(
+    "market_intel_query_cache_similarity",
+    "Cosine similarity between a search query and its nearest cached query",
+    buckets=(0.5, 0.7, 0.8, 0.85, 0.9, 0.925, 0.95, 0.975, 0.99, 1.0)
+)
+OPENAI_TOKENS = Counter(
+    "market_intel_openai_tokens_total",
+    "Tokens reported by OpenAI responses",
+    ["model", "kind"]
+)
+
+
+class _Stage:
+    """Metric children for one stage, resolved once instead of per call."""
+
+    __slots__ = ("seconds", "errors", "in_flight")
+
+    def __init__(self, stage: str):
+        self.seconds = STAGE_SECONDS.labels(stage)
+        self.errors = STAGE_ERRORS.labels(stage)
+        self.in_flight = STAGE_IN_FLIGHT.labels(stage)
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: _Stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.stage.in_flight.inc()
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stage.seconds.observe(time.perf_counter() - self.start)
+        self.stage.in_flight.dec()
+        # A stream consumer stopping early is not a failure
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.stage.errors.inc()
+        return False
+
+
+_stages: Dict[str, _Stage] = {}
+
+
+def _stage(name: str) -> _Stage:
+    stage = _stages.get(name)
+    if stage is None:
+        stage = _stages[name] = _Stage(name)
+    return stage
+
+
+def track(stage: str):
+    """Time a block as ``stage``."""
+    if not settings.METRICS_ENABLED:
+        return nullcontext()
+    return _Timer(_stage(stage))
+
+
+def timed(stage: str):
+    """Decorate a function, coroutine or async generator to record ``stage``.
+
+    Async generators are timed until exhausted. With ``METRICS_ENABLED``
+    off the function is returned unwrapped, so the overhead is zero.
+    """
+    def decorator(func):
+        if not settings.METRICS_ENABLED:
+            return func
+        metrics = _stage(stage)
+
+        if inspect.isasyncgenfunction(func):
+            @wraps(func)
+            async def gen_wrapper(*args, **kwargs):
+                with _Timer(metrics):
+                    generator = func(*args, **kwargs)
+                    try:
+                        async for item in generator:
+                            yield item
+                    finally:
+                        # Close it now if our consumer stopped early, so its cleanup runs
+                        await generator.aclose()
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _Timer(metrics):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(metrics):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each HTTP request until its response starts.
+
+    Requests are labelled by route template (``/api/documents/{document_id}``)
+    so path parameters don't explode label cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        observed = False
+
+        def observe():
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            route = scope.get("route")
+            HTTP_SECONDS.labels(
+                scope["method"], route.path if route else "unmatched", str(status)
+            ).observe(time.perf_counter() - start)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                observe()
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            observe()
+            HTTP_IN_FLIGHT.dec()
+
+
+def record_usage(model: str, usage) -> None:
+    """Count the prompt and completion tokens of an OpenAI response."""
+    if usage is None or not settings.METRICS_ENABLED:
+        return
+    OPENAI_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    OPENAI_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Record every MongoDB command's latency via driver command monitoring."""
+
+    def __init__(self):
+        self._collections: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return event.connection_id, event.request_id
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self._collections[self._key(event)] = collection if isinstance(collection, str) else ""
+
+    def _observe(self, event, outcome: str):
+        with self._lock:
+            collection = self._collections.pop(self._key(event), "")
+        MONGO_SECONDS.labels(event.command_name, collection, outcome).observe(
+            event.duration_micros / 1_000_000
+        )
+
+    def succeeded(self, event):
+        self._observe(event, "ok")
+
+    def failed(self, event):
+        self._observe(event, "error")
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Track MongoDB connection churn and pool usage via driver pool monitoring."""
+
+    def __init__(self):
+        self._created = MONGO_CONNECTIONS.labels("created")
+        self._closed = MONGO_CONNECTIONS.labels("closed")
+        self._checkout_failed = MONGO_CONNECTIONS.labels("checkout_failed")
+
+    def connection_created(self, event):
+        self._created.inc()
+        MONGO_CONNECTIONS_OPEN.inc()
+
+    def connection_closed(self, event):
+        self._closed.inc()
+        MONGO_CONNECTIONS_OPEN.dec()
+
+    def connection_checked_out(self, event):
+        MONGO_CONNECTIONS_IN_USE.inc()
+
+    def connection_checked_in(self, event):
+        MONGO_CONNECTIONS_IN_USE.dec()
+
+    def connection_check_out_failed(self, event):
+        self._checkout_failed.inc()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
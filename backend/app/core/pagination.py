@@ -0,0 +1,60 @@
+from beanie import PydanticObjectId
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING
+from typing import Dict, List, Optional, Tuple, Type
+import base64
+import json
+
+
+def encode_cursor(created_at: datetime, item_id: PydanticObjectId) -> str:
+    """Opaque cursor pointing just past ``(created_at, _id)``."""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(item_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(raw["t"]), PydanticObjectId(raw["id"])
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(cursor: Optional[str], descending: bool = True) -> Dict:
+    """Mongo filter selecting items after ``cursor`` in ``(created_at, _id)`` order."""
+    if not cursor:
+        return {}
+    created_at, item_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {"$or": [
+        {"created_at": {op: created_at}},
+        {"created_at": created_at, "_id": {op: item_id}}
+    ]}
+
+
+async def paginate(
+    model,
+    filters: Dict,
+    projection: Type,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List, Optional[str]]:
+    """Fetch one keyset page of ``model`` projected onto ``projection``.
+
+    Sorting on ``(created_at, _id)`` keeps pages stable when timestamps tie.
+    Returns the items and the cursor of the next page, or None on the last.
+    """
+    direction = DESCENDING if descending else ASCENDING
+    query = {**filters, **keyset_filter(cursor, descending)}
+
+    items = await model.find(query).sort(
+        [("created_at", direction), ("_id", direction)]
+    ).limit(limit + 1).project(projection).to_list()
+
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1].created_at, items[-1].id)
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+import time
+from app.core.config import settings
+
+
+class Readiness:
+    """Initialize external dependencies in the background and track their state.
+
+    Each dependency gets its own task that retries with capped exponential
+    backoff until it succeeds, so startup never waits on the network and a
+    flaky service doesn't crash the process. ``GET /ready`` reports the
+    state; ``GET /health`` stays a pure liveness check.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Dict] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, name: str, initialize: Callable[[], Awaitable]):
+        """Begin initializing ``name`` in the background."""
+        self._states[name] = {
+            "status": "starting",
+            "attempts": 0,
+            "error": None,
+            "ready_at": None,
+            "startup_seconds": None
+        }
+        self._tasks.append(
+            asyncio.create_task(self._initialize(name, initialize), name=f"init-{name}")
+        )
+
+    async def _initialize(self, name: str, initialize: Callable[[], Awaitable]):
+        state = self._states[name]
+        started = time.perf_counter()
+        while True:
+            state["attempts"] += 1
+            try:
+                await initialize()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = min(
+                    settings.STARTUP_RETRY_BASE_SECONDS * 2 ** (state["attempts"] - 1),
+                    settings.STARTUP_RETRY_MAX_SECONDS
+                )
+                state.update(status="retrying", error=str(e))
+                print(f"❌ {name} unavailable (attempt {state['attempts']}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            state.update(
+                status="ready",
+                error=None,
+                ready_at=datetime.utcnow().isoformat(),
+                startup_seconds=round(time.perf_counter() - started, 3)
+            )
+            return
+
+    @property
+    def ready(self) -> bool:
+        return all(state["status"] == "ready" for state in self._states.values())
+
+    def report(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "dependencies": {name: dict(state) for name, state in self._states.items()}
+        }
+
+    async def stop(self):
+        """Cancel initializations that are still retrying."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+readiness = Readiness()
@@ -0,0 +1,59 @@
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import copy
+
+
+class SingleFlight:
+    """Coalesce concurrent identical async calls into one execution.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task and receive a copy of its result (or its
+    exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    async def do(self, name: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless an identical call is already in flight."""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        full_key = (name, key)
+
+        task = self._inflight.get(full_key)
+        if task is not None:
+            self.coalesced[name] = self.coalesced.get(name, 0) + 1
+            # Followers get their own copy so callers can't mutate each other's data
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[full_key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(full_key, None))
+        # Shield so a cancelled leader doesn't cancel the call for followers
+        return await asyncio.shield(task)
+
+    def coalesce(self, name: str):
+        """Decorate an async function so identical concurrent calls share one run."""
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = (repr(args), repr(sorted(kwargs.items())))
+                return await self.do(name, key, lambda: func(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return per-name call and coalesced counts plus in-flight size."""
+        return {
+            name: {
+                "calls": calls,
+                "coalesced": self.coalesced.get(name, 0),
+                "inflight": sum(1 for key in self._inflight if key[0] == name)
+            }
+            for name, calls in self.calls.items()
+        }
+
+
+singleflight = SingleFlight()
@@ -1,24 +1,49 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, db
+from app.core.metrics import RequestMetricsMiddleware
+from app.core.readiness import readiness
+from app.core.singleflight import singleflight
+from app.services.job_queue import job_queue
+from app.services.lexical_index import lexical_index
+from app.services.llm_service import llm_service
+from app.services.trend_snapshots import trend_snapshots
 from app.services.vector_service import vector_service
-from app.api import analysis, documents
+from app.api import analysis, documents, exports
+
+
+async def start_database():
+    """Connect to MongoDB, then start the services that read from it."""
+    if db.client is None:
+        await connect_to_mongo()
+    await job_queue.start()
+    await lexical_index.start()
+    await trend_snapshots.start()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
-    # Startup
+    # Startup: dependencies connect in the background so the app serves
+    # /health right away; GET /ready reports when they are up
     print("🚀 Starting AI Market Intelligence API...")
-    await connect_to_mongo()
-    await vector_service.initialize()
+    readiness.start("mongodb", start_database)
+    readiness.start("vector_store", vector_service.initialize)
     yield
     # Shutdown
     print("👋 Shutting down...")
+    await readiness.stop()
+    await trend_snapshots.stop()
+    await lexical_index.stop()
+    await job_queue.stop()
     await close_mongo_connection()
+    vector_service.close()
+    llm_service.embedding_cache.close()
 
 
 app = FastAPI(
@@ -34,11 +59,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Cache", "X-Next-Cursor"],
 )
 
+# Request latency and in-flight metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(analysis.router, prefix=settings.API_V1_PREFIX)
 app.include_router(documents.router, prefix=settings.API_V1_PREFIX)
+app.include_router(exports.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -55,3 +86,29 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness of each dependency; 503 until all are connected."""
+    report = readiness.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/stats")
+async def stats():
+    """Cache, request-coalescing, OpenAI rate-limit, keyword-index and snapshot counters."""
+    return {
+        "embedding_cache": llm_service.embedding_cache.stats(),
+        "lexical_index": lexical_index.stats(),
+        "openai": llm_service.rate_limit_stats(),
+        "query_cache": vector_service.query_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "trend_snapshots": trend_snapshots.stats()
+    }
@@ -1,5 +1,6 @@
-from beanie import Document
-from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from typing import Optional, Dict, List
 from datetime import datetime
 from enum import Enum
@@ -32,10 +33,21 @@ class SWOTAnalysis(Document):
     # Metadata
     source_documents: List[str] = Field(default_factory=list)  # Document IDs
     confidence_score: Optional[float] = None
+    context_tokens: Optional[int] = None  # Tokens of retrieved context sent to the LLM
+    request_hash: Optional[str] = None  # Response cache key for the request
+    corpus_version: Optional[int] = None  # Industry corpus version used
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
         name = "swot_analyses"
+        indexes = [
+            IndexModel([
+                ("request_hash", ASCENDING),
+                ("corpus_version", ASCENDING),
+                ("created_at", DESCENDING)
+            ]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)])
+        ]
 
 
 class TrendAnalysis(Document):
@@ -58,10 +70,58 @@ class TrendAnalysis(Document):
     
     # Metadata
     source_documents: List[str] = Field(default_factory=list)
+    context_tokens: Optional[int] = None  # Tokens of retrieved context sent to the LLM
+    request_hash: Optional[str] = None  # Response cache key for the request
+    corpus_version: Optional[int] = None  # Industry corpus version used
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
         name = "trend_analyses"
+        indexes = [
+            IndexModel([
+                ("request_hash", ASCENDING),
+                ("corpus_version", ASCENDING),
+                ("created_at", DESCENDING)
+            ]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)])
+        ]
+
+
+class TrendSnapshot(Document):
+    """Latest materialized trend analysis for one industry and time period."""
+    
+    industry: str
+    time_period: str
+    analysis_id: PydanticObjectId  # Current TrendAnalysis
+    watermark: Optional[datetime] = None  # updated_at of the newest document included
+    watermark_id: Optional[PydanticObjectId] = None  # Its _id, ordering documents written together
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
+    refreshes: int = 0
+    lease_until: Optional[datetime] = None  # Held by the worker refreshing it
+    
+    class Settings:
+        name = "trend_snapshots"
+        indexes = [
+            IndexModel([("industry", ASCENDING), ("time_period", ASCENDING)], unique=True)
+        ]
+
+
+class SWOTSummary(BaseModel):
+    """Projection of a SWOT analysis for history listings."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    company_name: str
+    industry: str
+    created_at: datetime
+
+
+class TrendSummary(BaseModel):
+    """Projection of a trend analysis for history listings."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    industry: str
+    time_period: str
+    created_at: datetime
 
 
 class Analysis(Document):
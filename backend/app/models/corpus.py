@@ -0,0 +1,19 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+
+
+class CorpusVersion(Document):
+    """Per-industry counter bumped whenever documents are ingested."""
+    
+    industry: str
+    version: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Settings:
+        name = "corpus_versions"
+        indexes = [
+            # One counter per industry, even when upserts race
+            IndexModel([("industry", ASCENDING)], unique=True)
+        ]
@@ -1,5 +1,6 @@
-from beanie import Document as BeanieDocument
-from pydantic import Field
+from beanie import Document as BeanieDocument, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from typing import Optional, List
 from datetime import datetime
 
@@ -13,7 +14,9 @@ class Document(BeanieDocument):
     url: Optional[str] = None
     category: str  # e.g., "news", "report", "analysis"
     industry: str  # e.g., "clean_tech", "energy", "automotive"
-    embedding_id: Optional[str] = None  # Pinecone vector ID
+    embedding_id: Optional[str] = None  # Pinecone vector ID of the first chunk
+    chunk_count: Optional[int] = None  # Vectors stored for this document
+    fingerprint: Optional[str] = None  # Hash of the embedded content and metadata
     metadata: dict = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -24,5 +27,63 @@ class Document(BeanieDocument):
             "title",
             "category",
             "industry",
-            "created_at"
+            # Upsert-by-source lookups during re-ingestion
+            IndexModel([("source", ASCENDING), ("url", ASCENDING)]),
+            # Incremental lexical index refreshes
+            IndexModel([("updated_at", ASCENDING)]),
+            # Documents an industry's trend snapshot hasn't seen yet
+            IndexModel([("industry", ASCENDING), ("updated_at", ASCENDING)]),
+            # Keyset pagination on (created_at, _id), with and without filters
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([
+                ("industry", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING)
+            ]),
+            IndexModel([
+                ("category", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING)
+            ]),
+            IndexModel([
+                ("industry", ASCENDING),
+                ("category", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING)
+            ])
         ]
+
+
+class DocumentSummary(BaseModel):
+    """Projection of a document for listings; leaves out the content."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    source: str
+    category: str
+    industry: str
+    created_at: datetime
+
+
+class DocumentFingerprint(BaseModel):
+    """Projection used to decide whether a re-ingested document changed."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    source: str
+    url: Optional[str] = None
+    industry: str
+    embedding_id: Optional[str] = None
+    chunk_count: Optional[int] = None
+    fingerprint: Optional[str] = None
+
+
+class DocumentText(BaseModel):
+    """Projection of the fields indexed for keyword search."""
+    
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    content: str
+    source: str
+    category: str
+    industry: str
+    updated_at: datetime
@@ -0,0 +1,67 @@
+from beanie import Document
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Type
+import hashlib
+import json
+from app.core.config import settings
+from app.models.corpus import CorpusVersion
+
+
+class AnalysisCache:
+    """Serve stored analyses for repeat requests until the corpus changes.
+
+    An analysis is reusable when it was produced for the same request fields
+    (``request_hash``) against the industry's current corpus version and is
+    younger than ``ANALYSIS_CACHE_TTL_SECONDS``. Ingestion bumps the corpus
+    version, so new documents invalidate every cached analysis for their
+    industry across all workers.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ANALYSIS_CACHE_TTL_SECONDS > 0
+
+    def request_hash(self, kind: str, fields: Dict) -> str:
+        """Hash the request fields that determine an analysis."""
+        payload = json.dumps({"kind": kind, **fields}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def corpus_version(self, industry: str) -> int:
+        """Return the current corpus version for an industry."""
+        record = await CorpusVersion.find_one(CorpusVersion.industry == industry)
+        return record.version if record else 0
+
+    async def bump(self, industries: Iterable[str]):
+        """Invalidate cached analyses for industries that gained documents."""
+        collection = CorpusVersion.get_motor_collection()
+        now = datetime.utcnow()
+        for industry in set(industries):
+            update = {"$inc": {"version": 1}, "$set": {"updated_at": now}}
+            try:
+                await collection.update_one({"industry": industry}, update, upsert=True)
+            except DuplicateKeyError:
+                # A concurrent upsert created the counter first; increment it
+                await collection.update_one({"industry": industry}, update)
+
+    async def lookup(
+        self,
+        model: Type[Document],
+        request_hash: str,
+        corpus_version: int
+    ) -> Optional[Document]:
+        """Return the newest stored analysis that is still valid."""
+        if not self.enabled:
+            return None
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.ANALYSIS_CACHE_TTL_SECONDS)
+        return await model.find(
+            {
+                "request_hash": request_hash,
+                "corpus_version": corpus_version,
+                "created_at": {"$gte": cutoff}
+            }
+        ).sort("-created_at").first_or_none()
+
+
+analysis_cache = AnalysisCache()
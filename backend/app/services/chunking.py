@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Dict, List
+import tiktoken
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str):
+    """Return the tiktoken encoding for a model, falling back to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the tokens ``text`` occupies for ``model``."""
+    return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
+def chunk_text(
+    text: str,
+    model: str,
+    chunk_tokens: int = 512,
+    overlap_tokens: int = 64
+) -> List[Dict]:
+    """Split text into token windows of ``chunk_tokens`` with overlap.
+
+    Returns ``{"index", "text", "tokens"}`` dicts. Text that fits in one
+    window is returned unchanged as a single chunk.
+    """
+    if overlap_tokens >= chunk_tokens:
+        raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+
+    encoding = get_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+
+    if len(tokens) <= chunk_tokens:
+        return [{"index": 0, "text": text, "tokens": len(tokens)}]
+
+    chunks = []
+    step = chunk_tokens - overlap_tokens
+    for start in range(0, len(tokens), step):
+        window = tokens[start:start + chunk_tokens]
+        chunks.append({
+            "index": len(chunks),
+            "text": encoding.decode(window),
+            "tokens": len(window)
+        })
+        if start + chunk_tokens >= len(tokens):
+            break
+
+    return chunks
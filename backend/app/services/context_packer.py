@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.metrics import timed
+from app.services.chunking import get_encoding
+
+SEPARATOR = "\n\n"
+
+
+def _bigrams(tokens: List[int]) -> Set[Tuple[int, int]]:
+    if len(tokens) < 2:
+        return {(token, -1) for token in tokens}
+    return set(zip(tokens, tokens[1:]))
+
+
+def _similarity(a: Set, b: Set) -> float:
+    """Jaccard similarity of two token-bigram sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextPacker:
+    """Pack retrieved passages into a token budget for an LLM prompt.
+
+    Passages are chosen greedily by maximal marginal relevance: each pick
+    balances its retrieval score against its overlap with passages already
+    chosen, so near-identical chunks don't crowd out new information.
+    Overlong passages are trimmed and near-duplicates are dropped outright.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @timed("rag.pack_context")
+    def pack(
+        self,
+        passages: List[Dict],
+        budget_tokens: Optional[int] = None,
+        max_passage_tokens: Optional[int] = None,
+        diversity: Optional[float] = None
+    ) -> Dict:
+        """Select passages (``{"text", "score", ...}``) to fill the budget.
+
+        Returns the joined ``context``, the ``tokens`` it uses, the selected
+        ``passages`` in priority order, and how many candidates were
+        ``dropped``.
+        """
+        budget = settings.RAG_CONTEXT_TOKENS if budget_tokens is None else budget_tokens
+        max_passage = settings.RAG_PASSAGE_MAX_TOKENS if max_passage_tokens is None else max_passage_tokens
+        weight = settings.RAG_MMR_LAMBDA if diversity is None else diversity
+
+        encoding = get_encoding(self.model)
+        separator_tokens = len(encoding.encode(SEPARATOR))
+
+        candidates = []
+        for passage in passages:
+            text = passage.get("text") or ""
+            tokens = encoding.encode(text, disallowed_special=())
+            if not tokens:
+                continue
+            if len(tokens) > max_passage:
+                tokens = tokens[:max_passage]
+                text = encoding.decode(tokens)
+            candidates.append({
+                "passage": {**passage, "text": text},
+                "tokens": len(tokens),
+                "bigrams": _bigrams(tokens),
+                "score": passage.get("score") or 0.0
+            })
+
+        # Normalize relevance so it is comparable with the [0, 1] overlap term
+        if candidates:
+            low = min(c["score"] for c in candidates)
+            high = max(c["score"] for c in candidates)
+            for c in candidates:
+                c["relevance"] = (c["score"] - low) / (high - low) if high > low else 1.0
+
+        selected: List[Dict] = []
+        used = 0
+        remaining = candidates
+        while remaining:
+            best, best_value = None, None
+            still_open = []
+            for c in remaining:
+                overlap = max((_similarity(c["bigrams"], s["bigrams"]) for s in selected), default=0.0)
+                if overlap >= settings.RAG_DUPLICATE_THRESHOLD:
+                    continue  # Near-duplicate of something already packed
+                cost = c["tokens"] + (separator_tokens if selected else 0)
+                if used + cost > budget:
+                    continue  # Doesn't fit; a shorter passage still might
+                still_open.append(c)
+                value = weight * c["relevance"] - (1 - weight) * overlap
+                if best_value is None or value > best_value:
+                    best, best_value = c, value
+
+            if best is None:
+                break
+            used += best["tokens"] + (separator_tokens if selected else 0)
+            selected.append(best)
+            remaining = [c for c in still_open if c is not best]
+
+        return {
+            "context": SEPARATOR.join(c["passage"]["text"] for c in selected),
+            "tokens": used,
+            "passages": [c["passage"] for c in selected],
+            "dropped": len(passages) - len(selected)
+        }
+
+
+context_packer = ContextPacker(settings.OPENAI_MODEL)
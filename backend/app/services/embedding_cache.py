@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+import numpy as np
+from app.services.quantization import QUANTIZATIONS, decode, encode
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """Build the cache key for an embedding of ``text`` under ``model``."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: bounded in-process LRU plus optional SQLite.
+
+    Both tiers hold vectors as packed bytes: float32, or with ``int8``
+    quantization one byte per dimension plus a scale, a quarter of the size
+    at a cosine similarity above 0.999 to the original. Lookups return new
+    float32 arrays.
+
+    The memory tier is only touched from the event loop. SQLite reads and
+    writes run on worker threads, serialized by ``_lock`` because they share
+    one connection.
+    """
+
+    def __init__(self, max_entries: int = 5000, path: Optional[str] = None, quantization: str = "none"):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Embedding cache quantization must be one of {QUANTIZATIONS}")
+
+        self.max_entries = max_entries
+        self.quantization = quantization
+        # Each encoding gets its own table, so switching never misreads old rows
+        self._table = "embeddings" if quantization == "none" else f"embeddings_{quantization}"
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._db is not None
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for the keys that are present."""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is None:
+                missing.append(key)
+                continue
+            self._memory.move_to_end(key)
+            found[key] = decode(vector, self.quantization)
+            self.hits += 1
+
+        if missing and self._db is not None:
+            for key, blob in await asyncio.to_thread(self._read, missing):
+                self._remember(key, blob)
+                found[key] = decode(blob, self.quantization)
+                self.disk_hits += 1
+
+        self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    async def put_many(self, items: Dict[str, np.ndarray]):
+        """Store vectors in the memory tier and, if configured, on disk."""
+        packed = {key: encode(vector, self.quantization) for key, vector in items.items()}
+        for key, vector in packed.items():
+            self._remember(key, vector)
+
+        if self._db is not None and packed:
+            await asyncio.to_thread(self._write, list(packed.items()))
+
+    def _read(self, keys: List[str]) -> List[Tuple[str, bytes]]:
+        rows = []
+        with self._lock:
+            if self._db is None:
+                return rows
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._db.execute(
+                    f"SELECT key, vector FROM {self._table} WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        return rows
+
+    def _write(self, rows: List[Tuple[str, bytes]]):
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, vector) VALUES (?, ?)",
+                rows
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, vector: bytes):
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters and current size."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._memory),
+            "memory_bytes": sum(len(vector) for vector in self._memory.values()),
+            "quantization": self.quantization
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
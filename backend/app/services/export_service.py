@@ -0,0 +1,135 @@
+from beanie import Document as BeanieDocument
+from bson import ObjectId
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Type
+import csv
+import io
+import json
+import zlib
+from app.core.config import settings
+from app.core.metrics import timed
+
+# Rows are buffered into chunks of about this size before being sent
+CHUNK_BYTES = 64 * 1024
+
+
+def export_filters(
+    industry: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Dict:
+    """Mongo filter for an export; the date range applies to ``created_at``."""
+    filters: Dict = {}
+    if industry:
+        filters["industry"] = industry
+    if category:
+        filters["category"] = category
+    if since or until:
+        filters["created_at"] = {}
+        if since:
+            filters["created_at"]["$gte"] = since
+        if until:
+            filters["created_at"]["$lt"] = until
+    return filters
+
+
+def columns(model: Type[BeanieDocument]) -> List[str]:
+    """Export columns for a model: its ID followed by its fields in declaration order."""
+    return ["id"] + [name for name in model.model_fields if name not in ("id", "revision_id")]
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_value(item) for item in value]
+    return value
+
+
+class ExportService:
+    """Stream whole collections as NDJSON or CSV in constant memory.
+
+    Raw documents are read from a Motor cursor in ``EXPORT_BATCH_SIZE``
+    batches, in ``(created_at, _id)`` order, without model validation. Rows
+    are encoded and yielded in chunks as the cursor advances, so output
+    starts with the first batch.
+    """
+
+    async def rows(self, model: Type[BeanieDocument], filters: Dict) -> AsyncIterator[Dict]:
+        """Matching documents as JSON-ready dicts with ``_id`` exposed as ``id``."""
+        cursor = model.get_motor_collection().find(
+            filters,
+            {"revision_id": 0},
+            batch_size=settings.EXPORT_BATCH_SIZE
+        ).sort([("created_at", 1), ("_id", 1)])
+        try:
+            async for raw in cursor:
+                row = {"id": str(raw.pop("_id"))}
+                row.update((key, _value(value)) for key, value in raw.items())
+                yield row
+        finally:
+            # Release the server-side cursor when the client disconnects early
+            await cursor.close()
+
+    async def ndjson(self, rows: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+        buffer = []
+        size = 0
+        async for row in rows:
+            line = json.dumps(row, default=str) + "\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_BYTES:
+                yield "".join(buffer).encode("utf-8")
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+    async def csv(self, rows: AsyncIterator[Dict], fieldnames: List[str]) -> AsyncIterator[bytes]:
+        """CSV with a header row; lists and objects are written as JSON."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        async for row in rows:
+            writer.writerow({
+                key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                for key, value in row.items()
+            })
+            if output.tell() >= CHUNK_BYTES:
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate()
+        if output.tell():
+            yield output.getvalue().encode("utf-8")
+
+    async def gzip(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Compress a byte stream into one gzip member as it is produced."""
+        compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @timed("export.stream")
+    async def stream(
+        self,
+        model: Type[BeanieDocument],
+        filters: Dict,
+        format: str = "ndjson",
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Encoded export of ``model``'s documents matching ``filters``."""
+        rows = self.rows(model, filters)
+        chunks = self.csv(rows, columns(model)) if format == "csv" else self.ndjson(rows)
+        if compress:
+            chunks = self.gzip(chunks)
+        async for chunk in chunks:
+            yield chunk
+
+
+export_service = ExportService()
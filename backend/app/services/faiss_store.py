@@ -0,0 +1,522 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import os
+import threading
+
+import faiss
+import numpy as np
+
+from app.services.vector_store import VectorStore, matches_filter
+
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+QUANTIZATIONS = ("none", "sq8", "pq")
+
+
+class FaissVectorStore(VectorStore):
+    """In-process vector store backed by FAISS.
+
+    Vectors are L2-normalized and searched by inner product, which matches
+    Pinecone's cosine metric. FAISS positions are assigned sequentially;
+    deletes leave tombstones that are excluded at query time and dropped by
+    ``compact()``. Equality filters on ``industry``, ``category`` and
+    ``doc_id`` are answered from in-memory postings and pushed into FAISS as
+    an ID selector.
+
+    With a ``path``, the float32 vectors live in an append-only file that is
+    memory-mapped for reads: ``flat`` search, ``fetch``, training and
+    compaction all scan it in place, so the page cache rather than the heap
+    holds them. Every write is also appended to a log before it is applied,
+    and checkpoints (on ``save()``, ``close()`` and every
+    ``checkpoint_vectors`` logged writes) persist the IVF/HNSW index and the
+    metadata. Loading replays the log, so a crash loses no acknowledged
+    write. Files are ``{path}.meta.json`` plus ``{path}.<n>.vectors``,
+    ``{path}.<n>.index`` and ``{path}.<n>.log``.
+
+    ``quantization`` compresses the in-memory index: ``sq8`` keeps one byte
+    per dimension (4x smaller) with any index type, ``pq`` keeps ``pq_m``
+    bytes per vector with ``ivf``. Both need training data, so vectors are
+    searched exactly until there is enough.
+    """
+
+    FILTER_FIELDS = ("industry", "category", "doc_id")
+    # Filters matching at most this many vectors are scored exactly
+    EXACT_SEARCH_LIMIT = 2048
+    # Compact on save once this fraction of positions are tombstones
+    COMPACT_RATIO = 0.25
+    # Vectors used to fit the ``sq8`` per-dimension ranges
+    SQ_TRAIN_SIZE = 1000
+    # PQ codebooks have 2^8 centroids per sub-vector
+    PQ_NBITS = 8
+    # Rows scored per block by exact search, bounding its temporary memory
+    SCAN_BLOCK = 65536
+
+    def __init__(
+        self,
+        dimension: int,
+        index_type: str = "flat",
+        path: Optional[str] = None,
+        nlist: int = 100,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        quantization: str = "none",
+        pq_m: int = 192,
+        checkpoint_vectors: int = 50000
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"FAISS index type must be one of {INDEX_TYPES}")
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"FAISS quantization must be one of {QUANTIZATIONS}")
+        if quantization == "pq" and index_type != "ivf":
+            # IndexPQ ignores ID selectors and HNSW-PQ has no inner product metric
+            raise ValueError("FAISS pq quantization requires the ivf index type")
+        if quantization == "pq" and dimension % pq_m:
+            raise ValueError(f"FAISS_PQ_M ({pq_m}) must divide the dimension ({dimension})")
+
+        self.dimension = dimension
+        self.index_type = index_type
+        self.path = path
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.quantization = quantization
+        self.pq_m = pq_m
+        self.checkpoint_vectors = checkpoint_vectors
+        self.index = None
+        self._lock = threading.RLock()
+        # position -> normalized vector; a memmap of the vectors file when persisted
+        self._rows: Optional[np.ndarray] = None
+        self._buffer = np.empty((0, dimension), dtype="float32")
+        self._vector_file = None
+        self._log_file = None
+        self._checkpoint = 0
+        self._vectors_checkpoint = 0  # Checkpoint whose compaction wrote the vectors file
+        self._committed_vectors = 0
+        self._logged = 0  # Vectors written since the last checkpoint
+        self._reset()
+
+    def _reset(self):
+        self._ids: List[Optional[str]] = []  # position -> vector ID, None if deleted
+        self._metadata: List[Optional[Dict]] = []
+        self._positions: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._postings: Dict[str, Dict[object, Set[int]]] = {
+            field: defaultdict(set) for field in self.FILTER_FIELDS
+        }
+
+    # Index lifecycle
+
+    def _new_index(self):
+        """The FAISS index to search, or None when exact search over the rows is the index."""
+        metric = faiss.METRIC_INNER_PRODUCT
+        sq8 = faiss.ScalarQuantizer.QT_8bit
+        if self.index_type == "flat":
+            if self.quantization == "sq8":
+                return faiss.IndexScalarQuantizer(self.dimension, sq8, metric)
+            return None
+        if self.index_type == "hnsw":
+            if self.quantization == "sq8":
+                index = faiss.IndexHNSWSQ(self.dimension, sq8, self.hnsw_m, metric)
+            else:
+                index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, metric)
+            index.hnsw.efSearch = self.ef_search
+            return index
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        if self.quantization == "sq8":
+            return faiss.IndexIVFScalarQuantizer(quantizer, self.dimension, self.nlist, sq8, metric)
+        if self.quantization == "pq":
+            return faiss.IndexIVFPQ(quantizer, self.dimension, self.nlist, self.pq_m, self.PQ_NBITS, metric)
+        return faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist, metric)
+
+    @property
+    def _train_size(self) -> int:
+        # FAISS warns below ~39 training points per centroid
+        if self.index_type == "ivf":
+            centroids = max(self.nlist, 2 ** self.PQ_NBITS) if self.quantization == "pq" else self.nlist
+            return centroids * 39
+        return self.SQ_TRAIN_SIZE
+
+    @property
+    def _trained(self) -> bool:
+        return self.index is not None and self.index.is_trained
+
+    @property
+    def initialized(self) -> bool:
+        return self._rows is not None
+
+    def initialize(self):
+        with self._lock:
+            self.index = self._new_index()
+            self._rows = self._buffer[:0]
+            if not self.path:
+                print(f"✅ Created in-memory FAISS {self.index_type} index")
+            elif os.path.exists(self._meta_path):
+                self._load()
+                print(f"✅ Loaded FAISS index from {self.path} ({len(self._positions)} vectors)")
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._vector_file = open(self._file("vectors", self._vectors_checkpoint), "wb")
+                self._commit()
+                print(f"✅ Created FAISS {self.index_type} index at {self.path}")
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.path}.meta.json"
+
+    def _file(self, kind: str, checkpoint: int) -> str:
+        return f"{self.path}.{checkpoint}.{kind}"
+
+    def _load(self):
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if "checkpoint" not in meta:
+            raise ValueError(
+                f"FAISS index at {self.path} predates the vectors file and write log; "
+                "remove it and re-ingest the corpus"
+            )
+        quantization = meta.get("quantization", "none")
+        expected = (self.dimension, self.index_type, self.quantization)
+        if (meta["dimension"], meta["index_type"], quantization) != expected:
+            raise ValueError(
+                f"FAISS index at {self.path} is {meta['index_type']}/{quantization}/{meta['dimension']}, "
+                f"expected {self.index_type}/{self.quantization}/{self.dimension}"
+            )
+
+        self._checkpoint = meta["checkpoint"]
+        self._vectors_checkpoint = self._committed_vectors = meta["vectors_checkpoint"]
+        if meta["indexed"]:
+            # IO_FLAG_MMAP only maps IVF inverted lists, read-only, in FAISS 1.7,
+            # so the index is read into memory; the vectors file stays mapped
+            self.index = faiss.read_index(self._file("index", self._checkpoint))
+        self._register(meta["ids"], meta["metadata"])
+        self._replay()
+
+        # Rows past the log were written by a batch that never got logged
+        vectors_path = self._file("vectors", self._vectors_checkpoint)
+        size = len(self._ids) * self.dimension * 4
+        if os.path.getsize(vectors_path) < size:
+            raise ValueError(f"FAISS vectors file {vectors_path} is shorter than its log")
+        os.truncate(vectors_path, size)
+        self._vector_file = open(vectors_path, "ab")
+        self._rows = self._map(len(self._ids))
+        self._sync_index()
+
+    def _replay(self):
+        """Apply the writes logged since the checkpoint, dropping a torn last line."""
+        log_path = self._file("log", self._checkpoint)
+        offset = 0
+        with open(log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                offset += len(line)
+                self._remove(entry.get("delete", []) + entry.get("upsert", []))
+                if "upsert" in entry:
+                    self._register(entry["upsert"], entry["metadata"])
+                    self._logged += len(entry["upsert"])
+        os.truncate(log_path, offset)
+        self._log_file = open(log_path, "a")
+
+    def _map(self, count: int) -> np.ndarray:
+        if not count:
+            return self._buffer[:0]
+        return np.memmap(
+            self._file("vectors", self._vectors_checkpoint),
+            dtype="float32", mode="r", shape=(count, self.dimension)
+        )
+
+    def save(self):
+        """Checkpoint the index and metadata so the log can start over."""
+        if not self.path or not self.initialized:
+            return
+
+        with self._lock:
+            if len(self._ids) and len(self._deleted) / len(self._ids) > self.COMPACT_RATIO:
+                self._compact()
+            self._commit()
+
+    def _commit(self):
+        previous = (self._checkpoint, self._committed_vectors) if self._log_file else None
+        checkpoint = self._checkpoint + 1
+        indexed = self._trained and self.index.ntotal > 0
+        if indexed:
+            faiss.write_index(self.index, self._file("index", checkpoint))
+        log_file = open(self._file("log", checkpoint), "w")
+
+        # Replacing the metadata is the commit point; older files are unused after it
+        with open(f"{self._meta_path}.tmp", "w") as f:
+            json.dump({
+                "dimension": self.dimension,
+                "index_type": self.index_type,
+                "quantization": self.quantization,
+                "checkpoint": checkpoint,
+                "vectors_checkpoint": self._vectors_checkpoint,
+                "indexed": indexed,
+                "ids": self._ids,
+                "metadata": self._metadata
+            }, f)
+        os.replace(f"{self._meta_path}.tmp", self._meta_path)
+
+        if previous:
+            self._log_file.close()
+            stale = [self._file("index", previous[0]), self._file("log", previous[0])]
+            if previous[1] != self._vectors_checkpoint:
+                stale.append(self._file("vectors", previous[1]))
+            for stale_path in stale:
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+        self._log_file = log_file
+        self._checkpoint = checkpoint
+        self._committed_vectors = self._vectors_checkpoint
+        self._logged = 0
+
+    def close(self):
+        with self._lock:
+            self.save()
+            for handle in (self._vector_file, self._log_file):
+                if handle:
+                    handle.close()
+            self._vector_file = self._log_file = None
+            self._rows = None
+
+    def compact(self):
+        """Rebuild the index and vectors without tombstoned positions."""
+        with self._lock:
+            self._compact()
+            if self.path:
+                self._commit()
+
+    def _compact(self):
+        live = np.asarray(
+            [position for position, vector_id in enumerate(self._ids) if vector_id is not None],
+            dtype="int64"
+        )
+        ids = [self._ids[position] for position in live]
+        metadata = [self._metadata[position] for position in live]
+        rows = self._rows
+
+        if self.path:
+            # A new file, so the committed one stays intact until the next checkpoint
+            self._vector_file.close()
+            self._vectors_checkpoint = self._checkpoint + 1
+            self._vector_file = open(self._file("vectors", self._vectors_checkpoint), "wb")
+        self._buffer = np.empty((0, self.dimension), dtype="float32")
+        self._rows = self._buffer[:0]
+        self.index = self._new_index()
+        self._reset()
+
+        for start in range(0, len(live), self.SCAN_BLOCK):
+            self._write_rows(np.ascontiguousarray(rows[live[start:start + self.SCAN_BLOCK]]))
+        self._register(ids, metadata)
+        self._sync_index()
+
+    # Writes
+
+    def upsert(self, vectors: List[Dict]):
+        # Last write wins for duplicate IDs within one batch
+        unique = list({vector["id"]: vector for vector in vectors}.values())
+        if not unique:
+            return
+
+        matrix = np.asarray([vector["values"] for vector in unique], dtype="float32")
+        faiss.normalize_L2(matrix)
+        ids = [vector["id"] for vector in unique]
+        metadata = [vector.get("metadata") or {} for vector in unique]
+
+        with self._lock:
+            # Rows first: a logged write always has its vectors on disk
+            self._write_rows(matrix)
+            self._log({"upsert": ids, "metadata": metadata})
+            self._remove(ids)
+            self._register(ids, metadata)
+            self._sync_index()
+            self._logged += len(ids)
+            if self.path and self._logged >= self.checkpoint_vectors:
+                self.save()
+
+    def _write_rows(self, matrix: np.ndarray):
+        count = len(self._rows)
+        if self._vector_file:
+            self._vector_file.write(matrix.tobytes())
+            self._vector_file.flush()
+            self._rows = self._map(count + len(matrix))
+            return
+
+        if count + len(matrix) > len(self._buffer):
+            grown = np.empty((max(2 * len(self._buffer), count + len(matrix)), self.dimension), dtype="float32")
+            grown[:count] = self._rows
+            self._buffer = grown
+        self._buffer[count:count + len(matrix)] = matrix
+        self._rows = self._buffer[:count + len(matrix)]
+
+    def _log(self, entry: Dict):
+        if self._log_file:
+            # Flushed to the OS, so only a host crash can lose it
+            self._log_file.write(json.dumps(entry) + "\n")
+            self._log_file.flush()
+
+    def _register(self, ids: List[Optional[str]], metadata: List[Optional[Dict]]):
+        for vector_id, meta in zip(ids, metadata):
+            position = len(self._ids)
+            self._ids.append(vector_id)
+            self._metadata.append(meta)
+            if vector_id is None:
+                self._deleted.add(position)
+            else:
+                self._positions[vector_id] = position
+                self._index_postings(position, meta)
+
+    def _sync_index(self):
+        """Add rows the FAISS index has not seen, training it once there are enough."""
+        if self.index is None:
+            return
+        if not self.index.is_trained:
+            if len(self._rows) < self._train_size:
+                return
+            self.index.train(np.ascontiguousarray(self._rows))
+        if self.index.ntotal < len(self._rows):
+            self.index.add(np.ascontiguousarray(self._rows[self.index.ntotal:]))
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            ids = [vector_id for vector_id in ids if vector_id in self._positions]
+            if ids:
+                self._log({"delete": ids})
+                self._remove(ids)
+
+    def _remove(self, ids: Iterable[str]):
+        for vector_id in ids:
+            position = self._positions.pop(vector_id, None)
+            if position is None:
+                continue
+            for field in self.FILTER_FIELDS:
+                value = self._metadata[position].get(field)
+                if isinstance(value, (str, int, float, bool)):
+                    self._postings[field][value].discard(position)
+            self._ids[position] = None
+            self._metadata[position] = None
+            self._deleted.add(position)
+
+    def _index_postings(self, position: int, metadata: Dict):
+        for field in self.FILTER_FIELDS:
+            value = metadata.get(field)
+            if isinstance(value, (str, int, float, bool)):
+                self._postings[field][value].add(position)
+
+    # Reads
+
+    def _candidates(self, filter: Optional[Dict]) -> Optional[Set[int]]:
+        """Return the live positions matching ``filter``, or None for all."""
+        if not filter:
+            return None
+
+        candidates: Optional[Set[int]] = None
+        for field, condition in filter.items():
+            if field not in self.FILTER_FIELDS:
+                continue
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            if "$eq" in condition:
+                values = [condition["$eq"]]
+            elif "$in" in condition:
+                values = condition["$in"]
+            else:
+                continue
+            postings = set().union(*(self._postings[field].get(value, set()) for value in values))
+            candidates = postings if candidates is None else candidates & postings
+
+        if candidates is None:
+            candidates = set(self._positions.values())
+        return {
+            position for position in candidates
+            if matches_filter(self._metadata[position], filter)
+        }
+
+    def _search_params(self, selector):
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+        if self.index_type == "ivf":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+        return faiss.SearchParameters(sel=selector)
+
+    def _exact(self, query: np.ndarray, positions: Optional[np.ndarray], top_k: int):
+        """Score rows in place, a block at a time; ``positions`` None scans every live row."""
+        total = len(self._rows) if positions is None else len(positions)
+        deleted = np.fromiter(self._deleted, dtype="int64", count=len(self._deleted))
+        best = np.empty(0, dtype="int64")
+        best_scores = np.empty(0, dtype="float32")
+        for start in range(0, total, self.SCAN_BLOCK):
+            end = min(start + self.SCAN_BLOCK, total)
+            if positions is None:
+                block = np.arange(start, end)
+                scores = self._rows[start:end] @ query[0]
+                scores[deleted[(deleted >= start) & (deleted < end)] - start] = -np.inf
+            else:
+                block = positions[start:end]
+                scores = self._rows[block] @ query[0]
+            best = np.concatenate([best, block])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best) > top_k:
+                keep = np.argpartition(-best_scores, top_k)[:top_k]
+                best, best_scores = best[keep], best_scores[keep]
+        order = np.argsort(-best_scores)
+        return [(int(best[i]), float(best_scores[i])) for i in order if best_scores[i] > -np.inf]
+
+    def fetch(self, ids: List[str]) -> List[Dict]:
+        """Stored vectors are L2-normalized."""
+        with self._lock:
+            found = [(vector_id, self._positions[vector_id]) for vector_id in ids if vector_id in self._positions]
+            vectors = np.asarray(self._rows[[position for _, position in found]])
+            return [
+                {"id": vector_id, "values": values, "metadata": self._metadata[position]}
+                for (vector_id, position), values in zip(found, vectors)
+            ]
+
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int,
+        filter: Optional[Dict] = None
+    ) -> List[Dict]:
+        query = np.asarray([vector], dtype="float32")
+        faiss.normalize_L2(query)
+
+        with self._lock:
+            candidates = self._candidates(filter)
+            live = len(self._positions) if candidates is None else len(candidates)
+            k = min(top_k, live)
+            if k == 0:
+                return []
+
+            if not self._trained or (candidates is not None and live <= self.EXACT_SEARCH_LIMIT):
+                positions = None if candidates is None else np.asarray(sorted(candidates), dtype="int64")
+                hits = self._exact(query, positions, k)
+            else:
+                # Keep the inner selector referenced for the duration of the search
+                selector = inner = None
+                if candidates is not None:
+                    selector = faiss.IDSelectorBatch(np.fromiter(candidates, dtype="int64"))
+                elif self._deleted:
+                    inner = faiss.IDSelectorBatch(np.fromiter(self._deleted, dtype="int64"))
+                    selector = faiss.IDSelectorNot(inner)
+                scores, positions = self.index.search(query, k, params=self._search_params(selector))
+                hits = [
+                    (int(position), float(score))
+                    for position, score in zip(positions[0], scores[0])
+                    if position >= 0
+                ]
+
+            return [
+                {"id": self._ids[position], "score": score, "metadata": self._metadata[position]}
+                for position, score in hits
+            ]
+
+    def __len__(self) -> int:
+        return len(self._positions)
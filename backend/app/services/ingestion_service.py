@@ -0,0 +1,201 @@
+from beanie import PydanticObjectId
+from datetime import datetime
+from pymongo import UpdateOne
+from typing import List, Dict, Optional, Tuple
+import hashlib
+import json
+from app.core.database import bulk_write, insert_one
+from app.models.document import Document, DocumentFingerprint
+from app.services.analysis_cache import analysis_cache
+from app.services.embedding_cache import normalize_text
+from app.services.lexical_index import lexical_index
+from app.services.vector_service import vector_service
+
+# Fields mirrored into vector metadata; a change to any of them means re-embedding
+FINGERPRINT_FIELDS = ("title", "source", "category", "industry")
+
+
+def fingerprint(item: Dict) -> str:
+    """Hash of a document's content and the metadata stored with its vectors."""
+    fields = [normalize_text(item["content"])] + [item[field] for field in FINGERPRINT_FIELDS]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
+
+
+class IngestionService:
+    """Service for ingesting batches of documents into MongoDB and the vector store."""
+
+    async def ingest_documents(self, items: List[Dict], upsert: bool = False) -> List[Dict]:
+        """Ingest a batch of validated document payloads.
+
+        Uses batched embedding and upsert calls, then one unordered
+        ``bulk_write`` that inserts new documents and updates changed ones.
+        Returns one result per input item, in input order.
+
+        With ``upsert``, items that have a ``url`` are matched to stored
+        documents by ``(source, url)``. Unchanged ones are skipped
+        (``unchanged``); changed ones are re-embedded in place and their
+        stale vectors deleted (``updated``).
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        fingerprints = [fingerprint(item) for item in items]
+        existing = await self._find_existing(items) if upsert else {}
+
+        new: List[int] = []
+        changed: List[Tuple[int, DocumentFingerprint]] = []
+        latest = {self._key(item): position for position, item in enumerate(items)} if upsert else {}
+
+        for position, item in enumerate(items):
+            key = self._key(item)
+            current = existing.get(key)
+            if upsert and key[1] and latest[key] != position:
+                results[position] = self._result(
+                    None, item, "skipped", error="superseded by a later item with the same source and url"
+                )
+            elif current and current.fingerprint == fingerprints[position] and current.embedding_id:
+                results[position] = self._result(current.id, item, "unchanged", current.embedding_id)
+            elif current:
+                results[position] = self._result(current.id, item, "updated")
+                changed.append((position, current))
+            else:
+                new.append(position)
+
+        # IDs are assigned up front so vectors can reference documents that
+        # are only written once embedding succeeds
+        documents = {position: Document(id=PydanticObjectId(), **items[position]) for position in new}
+        for position, document in documents.items():
+            results[position] = self._result(document.id, items[position], "ingested")
+
+        to_embed = [(position, results[position]["id"], None) for position in new] + [
+            (position, results[position]["id"], current) for position, current in changed
+        ]
+        if not to_embed:
+            return results
+
+        # Embed and upsert new and changed documents in batches; changed
+        # documents keep their IDs, so their chunk vectors are overwritten
+        try:
+            stored = await vector_service.upsert_documents([
+                {
+                    "doc_id": doc_id,
+                    "content": items[position]["content"],
+                    "metadata": {field: items[position][field] for field in FINGERPRINT_FIELDS}
+                }
+                for position, doc_id, _ in to_embed
+            ])
+
+            # Drop chunks a shorter revision no longer has
+            await vector_service.delete_vectors(
+                [
+                    vector_id
+                    for (_, doc_id, current), vectors in zip(to_embed, stored)
+                    if current is not None
+                    for vector_id in vector_service.stale_vector_ids(
+                        doc_id, vectors["chunk_count"], current.chunk_count, current.embedding_id
+                    )
+                ],
+                industries={current.industry for _, _, current in to_embed if current is not None}
+            )
+        except Exception as e:
+            for position, _, _ in to_embed:
+                self._fail(results[position], f"embedding failed: {e}")
+            return results
+
+        # Insert new documents and update changed ones in a single unordered
+        # bulk write. The fingerprint is only stored once the vectors exist,
+        # so a failed run is retried in full next time.
+        now = datetime.utcnow()
+        operations = []
+        for (position, doc_id, current), vectors in zip(to_embed, stored):
+            fields = {
+                "embedding_id": vectors["embedding_id"],
+                "chunk_count": vectors["chunk_count"],
+                "fingerprint": fingerprints[position],
+                "updated_at": now
+            }
+            if current is None:
+                document = documents[position]
+                for field, value in fields.items():
+                    setattr(document, field, value)
+                operations.append(insert_one(document))
+            else:
+                fields.update(items[position])
+                operations.append(UpdateOne({"_id": PydanticObjectId(doc_id)}, {"$set": fields}))
+            results[position]["embedding_id"] = vectors["embedding_id"]
+        errors = await bulk_write(Document, operations)
+
+        orphaned = []
+        for index, error in errors.items():
+            position, doc_id, current = to_embed[index]
+            self._fail(results[position], error)
+            if current is None:
+                orphaned.extend(vector_service.document_vector_ids(doc_id, stored[index]["chunk_count"], None))
+        if orphaned:
+            # Vectors of documents that were never stored would surface in searches
+            await vector_service.delete_vectors(orphaned)
+
+        # Make the new text keyword-searchable right away in this process
+        if lexical_index.running:
+            for position, doc_id, _ in to_embed:
+                if results[position]["status"] == "failed":
+                    continue
+                item = items[position]
+                lexical_index.add(
+                    doc_id,
+                    item["title"],
+                    item["content"],
+                    {"source": item["source"], "category": item["category"], "industry": item["industry"]}
+                )
+
+        # New context invalidates cached analyses and searches for these
+        # industries, including the one a changed document moved away from
+        industries = {items[position]["industry"] for position, _, _ in to_embed}
+        industries.update(current.industry for _, _, current in to_embed if current is not None)
+        vector_service.query_cache.invalidate(industries)
+        await analysis_cache.bump(industries)
+
+        return results
+
+    @staticmethod
+    def _key(item: Dict) -> Tuple[str, Optional[str]]:
+        return item["source"], item.get("url")
+
+    async def _find_existing(self, items: List[Dict]) -> Dict[Tuple[str, str], DocumentFingerprint]:
+        """Stored documents matching the items' ``(source, url)`` pairs."""
+        keys = {self._key(item) for item in items if item.get("url")}
+        if not keys:
+            return {}
+
+        # Over-matches across pairs are filtered below; the query stays on the index
+        matches = await Document.find({
+            "source": {"$in": list({source for source, _ in keys})},
+            "url": {"$in": list({url for _, url in keys})}
+        }).project(DocumentFingerprint).to_list()
+        return {
+            (match.source, match.url): match
+            for match in matches
+            if (match.source, match.url) in keys
+        }
+
+    @staticmethod
+    def _result(
+        doc_id: Optional[PydanticObjectId],
+        item: Dict,
+        status: str,
+        embedding_id: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> Dict:
+        return {
+            "id": str(doc_id) if doc_id else None,
+            "title": item["title"],
+            "embedding_id": embedding_id,
+            "status": status,
+            "error": error
+        }
+
+    @staticmethod
+    def _fail(result: Dict, error: str):
+        result["status"] = "failed"
+        result["error"] = error
+
+
+ingestion_service = IngestionService()
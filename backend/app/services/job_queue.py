@@ -0,0 +1,277 @@
+from abc import ABC, abstractmethod
+from beanie import PydanticObjectId
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import uuid
+from app.core.config import settings
+from app.models.job import AnalysisJob, JobStatus
+
+JobHandler = Callable[[Dict], Awaitable[Dict]]
+
+
+class JobStore(ABC):
+    """Persistence for job records, exchanged as plain dicts."""
+
+    @abstractmethod
+    async def create(self, kind: str, request: Dict) -> Dict:
+        """Store a new queued job and return it."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job by ID, or None."""
+
+    @abstractmethod
+    async def claim(self, job_id: str) -> Optional[Dict]:
+        """Atomically move a queued job to running; None if already taken."""
+
+    @abstractmethod
+    async def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Record a job's result or error."""
+
+    @abstractmethod
+    async def release(self, job_id: str):
+        """Put a running job back in the queue, e.g. when its worker stops."""
+
+    @abstractmethod
+    async def requeue_stale(self, started_before: datetime) -> int:
+        """Requeue jobs left running since before ``started_before``; returns how many."""
+
+    @abstractmethod
+    async def queued_ids(self) -> List[str]:
+        """IDs of jobs still waiting to run, oldest first."""
+
+
+class MongoJobStore(JobStore):
+    """Job store backed by the ``analysis_jobs`` collection."""
+
+    @staticmethod
+    def _to_dict(job: AnalysisJob) -> Dict:
+        return {"id": str(job.id), **job.model_dump(exclude={"id", "revision_id"})}
+
+    async def create(self, kind: str, request: Dict) -> Dict:
+        job = AnalysisJob(kind=kind, request=request)
+        await job.insert()
+        return self._to_dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        if not PydanticObjectId.is_valid(job_id):
+            return None
+        job = await AnalysisJob.get(job_id)
+        return self._to_dict(job) if job else None
+
+    async def claim(self, job_id: str) -> Optional[Dict]:
+        raw = await AnalysisJob.get_motor_collection().find_one_and_update(
+            {"_id": PydanticObjectId(job_id), "status": JobStatus.QUEUED.value},
+            {"$set": {"status": JobStatus.RUNNING.value, "started_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        return self._to_dict(AnalysisJob.model_validate(raw)) if raw else None
+
+    async def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        await AnalysisJob.get_motor_collection().update_one(
+            {"_id": PydanticObjectId(job_id)},
+            {"$set": {
+                "status": (JobStatus.FAILED if error else JobStatus.SUCCEEDED).value,
+                "result": result,
+                "error": error,
+                "finished_at": datetime.utcnow()
+            }}
+        )
+
+    async def release(self, job_id: str):
+        await AnalysisJob.get_motor_collection().update_one(
+            {"_id": PydanticObjectId(job_id), "status": JobStatus.RUNNING.value},
+            {"$set": {"status": JobStatus.QUEUED.value, "started_at": None}}
+        )
+
+    async def requeue_stale(self, started_before: datetime) -> int:
+        result = await AnalysisJob.get_motor_collection().update_many(
+            {"status": JobStatus.RUNNING.value, "started_at": {"$lt": started_before}},
+            {"$set": {"status": JobStatus.QUEUED.value, "started_at": None}}
+        )
+        return result.modified_count
+
+    async def queued_ids(self) -> List[str]:
+        jobs = await AnalysisJob.find(
+            AnalysisJob.status == JobStatus.QUEUED
+        ).sort("+created_at").to_list()
+        return [str(job.id) for job in jobs]
+
+
+class InMemoryJobStore(JobStore):
+    """In-process job store for tests, benchmarks and offline runs."""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict] = {}
+
+    async def create(self, kind: str, request: Dict) -> Dict:
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {
+            "id": job_id,
+            "kind": kind,
+            "status": JobStatus.QUEUED,
+            "request": request,
+            "result": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None
+        }
+        return dict(self.jobs[job_id])
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def claim(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if not job or job["status"] != JobStatus.QUEUED:
+            return None
+        job.update(status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        return dict(job)
+
+    async def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        self.jobs[job_id].update(
+            status=JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+            result=result,
+            error=error,
+            finished_at=datetime.utcnow()
+        )
+
+    async def release(self, job_id: str):
+        job = self.jobs[job_id]
+        if job["status"] == JobStatus.RUNNING:
+            job.update(status=JobStatus.QUEUED, started_at=None)
+
+    async def requeue_stale(self, started_before: datetime) -> int:
+        stale = [
+            job for job in self.jobs.values()
+            if job["status"] == JobStatus.RUNNING and job["started_at"] < started_before
+        ]
+        for job in stale:
+            job.update(status=JobStatus.QUEUED, started_at=None)
+        return len(stale)
+
+    async def queued_ids(self) -> List[str]:
+        return [job_id for job_id, job in self.jobs.items() if job["status"] == JobStatus.QUEUED]
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobQueue:
+    """Bounded worker pool for long-running analyses.
+
+    Jobs are recorded in a ``JobStore`` and run by ``JOB_WORKERS`` tasks.
+    Handlers wrap calls to external providers in ``limit(provider)`` so that
+    each provider has its own concurrency cap regardless of worker count.
+    Claims are atomic, so several processes can share one Mongo store.
+    A job whose worker is cancelled goes back to the queue; one left running
+    by a crashed process is requeued on start once ``JOB_LEASE_SECONDS``
+    have passed since it was claimed.
+    """
+
+    def __init__(self, store: JobStore = None):
+        self.store = store or MongoJobStore()
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._feeder: Optional[asyncio.Task] = None
+        self._limits = {
+            "openai": asyncio.Semaphore(settings.JOB_OPENAI_CONCURRENCY),
+            "vector": asyncio.Semaphore(settings.JOB_VECTOR_CONCURRENCY)
+        }
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine that runs jobs of ``kind``."""
+        self._handlers[kind] = handler
+
+    @asynccontextmanager
+    async def limit(self, provider: str):
+        """Hold one of ``provider``'s concurrency slots."""
+        async with self._limits[provider]:
+            yield
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Start workers and pick up jobs left queued or stranded by a previous run."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.JOB_QUEUE_SIZE)
+        stale = await self.store.requeue_stale(
+            datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        )
+        if stale:
+            print(f"♻️ Requeued {stale} jobs left running by a previous run")
+        backlog = await self.store.queued_ids()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"job-worker-{i}")
+            for i in range(settings.JOB_WORKERS)
+        ]
+        if backlog:
+            self._feeder = asyncio.create_task(self._feed(backlog), name="job-backlog")
+
+    async def _feed(self, job_ids: List[str]):
+        # A backlog larger than the queue is fed in as workers drain it
+        for job_id in job_ids:
+            await self._queue.put(job_id)
+
+    async def stop(self):
+        """Cancel workers; unfinished jobs go back to the queue for the next start."""
+        tasks = self._workers + ([self._feeder] if self._feeder else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._feeder = None
+
+    async def submit(self, kind: str, request: Dict) -> Dict:
+        """Record a job and schedule it; returns the stored job."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        if not self.running:
+            await self.start()
+        if self._queue.full():
+            raise JobQueueFull("Job queue is full, retry later")
+
+        job = await self.store.create(kind, request)
+        self._queue.put_nowait(job["id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.store.get(job_id)
+
+    async def join(self):
+        """Wait until every scheduled job has been processed."""
+        await self._queue.join()
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.store.claim(job_id)
+                if job is None:
+                    continue  # Another worker or process took it
+                try:
+                    result = await self._handlers[job["kind"]](job["request"])
+                    await self.store.finish(job_id, result=result)
+                except asyncio.CancelledError:
+                    # Stopping mid-job; let the next start run it again
+                    await asyncio.shield(self.store.release(job_id))
+                    raise
+                except Exception as e:
+                    await self.store.finish(job_id, error=str(e))
+            except Exception as e:
+                print(f"❌ Job {job_id} could not be processed: {e}")
+            finally:
+                self._queue.task_done()
+
+
+job_queue = JobQueue()
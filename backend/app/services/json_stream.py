@@ -0,0 +1,64 @@
+from typing import Any, List, Tuple
+import json
+
+
+class JsonSectionParser:
+    """Extract completed top-level fields from a JSON object streamed in pieces.
+
+    Feed text fragments as they arrive; each call returns the ``(key, value)``
+    pairs whose values finished in that fragment, so callers can forward
+    whole sections (e.g. all strengths) long before the object closes.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._field_start = None
+
+    def feed(self, fragment: str) -> List[Tuple[str, Any]]:
+        sections: List[Tuple[str, Any]] = []
+        offset = len(self.text)
+        self.text += fragment
+
+        for position, char in enumerate(fragment, start=offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._field_start = position + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    sections.extend(self._complete(position))
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                sections.extend(self._complete(position))
+                self._field_start = position + 1
+
+        return sections
+
+    def _complete(self, end: int) -> List[Tuple[str, Any]]:
+        if self._field_start is None:
+            return []
+        field = self.text[self._field_start:end].strip()
+        if not field:
+            return []
+        try:
+            return list(json.loads("{" + field + "}").items())
+        except json.JSONDecodeError:
+            return []
+
+    def result(self) -> Any:
+        """Parse everything fed so far as one JSON document."""
+        return json.loads(self.text)
@@ -0,0 +1,201 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import heapq
+import math
+import re
+from app.core.config import settings
+from app.core.metrics import timed
+from app.models.document import Document, DocumentText
+from app.services.vector_store import matches_filter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Too common to discriminate; dropping them keeps posting lists short
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that "
+    "the their this to was were which will with".split()
+)
+
+# Writes from other processes may commit slightly out of timestamp order
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords; tickers and codes stay intact."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class LexicalIndex:
+    """In-memory BM25 inverted index over document titles and content.
+
+    Answers keyword queries without an embedding round-trip. Title terms
+    count ``LEXICAL_TITLE_WEIGHT`` times. The index is loaded from MongoDB
+    on start, kept current by ingestion, and periodically picks up documents
+    written by other processes (by ``updated_at``).
+    """
+
+    def __init__(self, k1: float = None, b: float = None, title_weight: float = None):
+        self.k1 = settings.BM25_K1 if k1 is None else k1
+        self.b = settings.BM25_B if b is None else b
+        self.title_weight = settings.LEXICAL_TITLE_WEIGHT if title_weight is None else title_weight
+        self.ready = False
+        self._postings: Dict[str, Dict[str, float]] = {}  # term -> {doc_id: weighted tf}
+        self._terms: Dict[str, Dict[str, float]] = {}  # doc_id -> weighted tf, for removal
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._metadata: Dict[str, Dict] = {}
+        self._watermark: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def running(self) -> bool:
+        """Whether this process loads and refreshes the index."""
+        return self._task is not None
+
+    def add(self, doc_id: str, title: str, content: str, metadata: Dict):
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+
+        frequencies: Dict[str, float] = Counter(tokenize(content))
+        for term, count in Counter(tokenize(title)).items():
+            frequencies[term] = frequencies.get(term, 0) + count * self.title_weight
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(frequencies.values())
+        self._terms[doc_id] = frequencies
+        self._lengths[doc_id] = length
+        self._total_length += length
+        self._metadata[doc_id] = {
+            **metadata,
+            "doc_id": doc_id,
+            "title": title,
+            "content_preview": content[:200]
+        }
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index, if present."""
+        frequencies = self._terms.pop(doc_id, None)
+        if frequencies is None:
+            return
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._metadata[doc_id]
+
+    @timed("lexical.search")
+    def search(self, query: str, top_k: int = 5, filter_dict: Dict = None) -> List[Dict]:
+        """Rank documents for ``query`` by BM25, best first.
+
+        Results have the same shape as ``VectorService.search_similar``;
+        ``id`` is the document ID.
+        """
+        if not self._lengths:
+            return []
+
+        count = len(self._lengths)
+        average_length = self._total_length / count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if filter_dict:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if matches_filter(self._metadata[doc_id], filter_dict)
+            }
+
+        return [
+            {
+                "id": doc_id,
+                "score": score,
+                "text": self._metadata[doc_id]["content_preview"],
+                "metadata": self._metadata[doc_id]
+            }
+            for doc_id, score in heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        ]
+
+    def add_documents(self, documents: Iterable[DocumentText]):
+        for document in documents:
+            self.add(
+                str(document.id),
+                document.title,
+                document.content,
+                {"source": document.source, "category": document.category, "industry": document.industry}
+            )
+
+    async def refresh(self) -> int:
+        """Index documents written since the last refresh; returns how many."""
+        query = {}
+        if self._watermark is not None:
+            query = {"updated_at": {"$gte": self._watermark - REFRESH_OVERLAP}}
+
+        indexed = 0
+        batch: List[DocumentText] = []
+        async for document in Document.find(query).project(DocumentText):
+            batch.append(document)
+            if len(batch) >= settings.INGEST_BATCH_SIZE:
+                indexed += self._apply(batch)
+                batch = []
+                await asyncio.sleep(0)  # Let requests through during a full load
+        indexed += self._apply(batch)
+
+        self.ready = True
+        return indexed
+
+    def _apply(self, batch: List[DocumentText]) -> int:
+        self.add_documents(batch)
+        for document in batch:
+            if self._watermark is None or document.updated_at > self._watermark:
+                self._watermark = document.updated_at
+        return len(batch)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                loading = not self.ready
+                indexed = await self.refresh()
+                if loading:
+                    print(f"✅ Lexical index loaded {indexed} documents")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Error refreshing lexical index: {e}")
+            if settings.LEXICAL_REFRESH_SECONDS <= 0:
+                return
+            await asyncio.sleep(settings.LEXICAL_REFRESH_SECONDS)
+
+    async def start(self):
+        """Load the index in the background and keep it refreshed."""
+        if settings.LEXICAL_INDEX_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(), name="lexical-index-refresh")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "documents": len(self),
+            "terms": len(self._postings)
+        }
+
+
+lexical_index = LexicalIndex()
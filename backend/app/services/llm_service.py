@@ -1,23 +1,119 @@
-from openai import AsyncOpenAI
 from app.core.config import settings
-from typing import List, Dict
+from app.core.metrics import record_usage, timed
+from app.core.singleflight import singleflight
+from app.services.chunking import count_tokens
+from app.services.embedding_cache import EmbeddingCache, cache_key
+from app.services.quantization import as_vector
+from app.services.rate_limiter import Priority, RateLimiter
+from typing import Any, AsyncIterator, List, Dict
+import asyncio
+import contextlib
 import json
+import numpy as np
+
+
+def _limiter(name: str, requests_per_minute: int, tokens_per_minute: int) -> RateLimiter:
+    return RateLimiter(
+        name,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        backoff_base=settings.OPENAI_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.OPENAI_BACKOFF_MAX_SECONDS
+    )
 
 
 class LLMService:
     """Service for interacting with OpenAI LLM."""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self._client = None
         self.model = settings.OPENAI_MODEL
+        self.embedding_model = settings.EMBEDDING_MODEL
+        self.embedding_cache = EmbeddingCache(
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            path=settings.EMBEDDING_CACHE_PATH,
+            quantization=settings.EMBEDDING_CACHE_QUANTIZATION
+        )
+        self.chat_limiter = _limiter("chat", settings.OPENAI_CHAT_RPM, settings.OPENAI_CHAT_TPM)
+        self.embedding_limiter = _limiter(
+            "embeddings", settings.OPENAI_EMBEDDING_RPM, settings.OPENAI_EMBEDDING_TPM
+        )
     
-    async def generate_swot_analysis(
+    @property
+    def client(self):
+        """OpenAI client, built on first use to keep imports and startup fast."""
+        if self._client is None:
+            from openai import AsyncOpenAI
+            
+            # Retries are scheduled by the rate limiters, not the SDK
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    async def _chat(
+        self,
+        messages: List[Dict],
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs
+    ) -> Any:
+        """Create a chat completion through the chat rate limiter."""
+        
+        response = await self.chat_limiter.run(
+            lambda: self.client.chat.completions.create(model=self.model, messages=messages, **kwargs),
+            tokens=self._chat_tokens(messages, kwargs),
+            priority=priority
+        )
+        record_usage(self.model, getattr(response, "usage", None))
+        return response
+    
+    @contextlib.asynccontextmanager
+    async def _chat_stream(
+        self,
+        messages: List[Dict],
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs
+    ) -> AsyncIterator[Any]:
+        """Open a streamed chat completion that holds a chat slot until the block exits."""
+        
+        async with self.chat_limiter.hold(
+            lambda: self.client.chat.completions.create(
+                model=self.model, messages=messages, stream=True, **kwargs
+            ),
+            tokens=self._chat_tokens(messages, kwargs),
+            priority=priority
+        ) as stream:
+            try:
+                yield stream
+            finally:
+                # Stop the upstream response if the consumer quit early
+                close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+                if close:
+                    await close()
+    
+    def _chat_tokens(self, messages: List[Dict], kwargs: Dict) -> int:
+        # Prompt tokens plus the completion budget count against TPM
+        tokens = sum(count_tokens(m["content"], self.model) + 4 for m in messages)
+        return tokens + (kwargs.get("max_tokens") or settings.OPENAI_COMPLETION_TOKENS_ESTIMATE)
+    
+    def rate_limit_stats(self) -> Dict:
+        """Queue depth and retry counters for each OpenAI quota."""
+        return {
+            "chat": self.chat_limiter.stats(),
+            "embeddings": self.embedding_limiter.stats()
+        }
+    
+    def _swot_messages(
         self, 
         company_name: str, 
         industry: str, 
         context: str
-    ) -> Dict:
-        """Generate SWOT analysis using LLM."""
+    ) -> List[Dict]:
+        """Build the chat messages for a SWOT analysis."""
         
         prompt = f"""You are a business analyst. Generate a comprehensive SWOT analysis for {company_name} in the {industry} industry.
 
@@ -36,12 +132,25 @@ Provide a structured SWOT analysis in the following JSON format:
 
 Focus on actionable insights based on the context provided."""
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a professional business analyst specializing in strategic analysis."},
-                {"role": "user", "content": prompt}
-            ],
+        return [
+            {"role": "system", "content": "You are a professional business analyst specializing in strategic analysis."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @singleflight.coalesce("llm.generate_swot_analysis")
+    @timed("llm.generate_swot_analysis")
+    async def generate_swot_analysis(
+        self, 
+        company_name: str, 
+        industry: str, 
+        context: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict:
+        """Generate SWOT analysis using LLM."""
+        
+        response = await self._chat(
+            messages=self._swot_messages(company_name, industry, context),
+            priority=priority,
             response_format={"type": "json_object"},
             temperature=0.7
         )
@@ -49,13 +158,31 @@ Focus on actionable insights based on the context provided."""
         result = json.loads(response.choices[0].message.content)
         return result
     
-    async def analyze_trends(
+    @timed("llm.stream_swot_analysis")
+    async def stream_swot_analysis(
+        self, 
+        company_name: str, 
+        industry: str, 
+        context: str
+    ) -> AsyncIterator[str]:
+        """Stream the raw JSON text of a SWOT analysis as it is generated."""
+        
+        async with self._chat_stream(
+            messages=self._swot_messages(company_name, industry, context),
+            response_format={"type": "json_object"},
+            temperature=0.7
+        ) as stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    def _trend_messages(
         self, 
         industry: str, 
         context: str,
         time_period: str = "current"
-    ) -> Dict:
-        """Analyze market trends using LLM."""
+    ) -> List[Dict]:
+        """Build the chat messages for a trend analysis."""
         
         prompt = f"""You are a market research analyst. Analyze market trends in the {industry} industry for {time_period}.
 
@@ -79,12 +206,25 @@ Provide a structured trend analysis in the following JSON format:
 
 Focus on data-driven insights and actionable predictions."""
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a market research analyst with deep industry expertise."},
-                {"role": "user", "content": prompt}
-            ],
+        return [
+            {"role": "system", "content": "You are a market research analyst with deep industry expertise."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @singleflight.coalesce("llm.analyze_trends")
+    @timed("llm.analyze_trends")
+    async def analyze_trends(
+        self, 
+        industry: str, 
+        context: str,
+        time_period: str = "current",
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict:
+        """Analyze market trends using LLM."""
+        
+        response = await self._chat(
+            messages=self._trend_messages(industry, context, time_period),
+            priority=priority,
             response_format={"type": "json_object"},
             temperature=0.7
         )
@@ -92,16 +232,145 @@ Focus on data-driven insights and actionable predictions."""
         result = json.loads(response.choices[0].message.content)
         return result
     
-    async def generate_embedding(self, text: str) -> List[float]:
-        """Generate embeddings for text using OpenAI."""
+    def _trend_update_messages(
+        self, 
+        industry: str, 
+        previous: Dict,
+        context: str,
+        time_period: str = "current"
+    ) -> List[Dict]:
+        """Build the chat messages for folding new documents into a trend analysis."""
         
-        response = await self.client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text
+        prompt = f"""You are a market research analyst. Below is your current analysis of market trends in the {industry} industry for {time_period}, followed by documents published since it was written.
+
+Current analysis:
+{json.dumps(previous, indent=2)}
+
+New documents:
+{context}
+
+Update the analysis in light of the new documents. Keep trends and insights that still hold, revise or drop those the new documents contradict, and add new ones they support. Respond in the same JSON format:
+{{
+    "emerging_trends": [
+        {{"trend": "trend name", "description": "detailed description", "impact": "high|medium|low"}},
+        ...
+    ],
+    "declining_trends": [
+        {{"trend": "trend name", "description": "detailed description", "impact": "high|medium|low"}},
+        ...
+    ],
+    "summary": "Overall market summary",
+    "key_insights": ["insight 1", "insight 2", ...],
+    "predictions": ["prediction 1", "prediction 2", ...]
+}}"""
+
+        return [
+            {"role": "system", "content": "You are a market research analyst with deep industry expertise."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @timed("llm.update_trends")
+    async def update_trends(
+        self, 
+        industry: str, 
+        previous: Dict,
+        context: str,
+        time_period: str = "current",
+        priority: Priority = Priority.BACKGROUND
+    ) -> Dict:
+        """Revise a trend analysis using only newly ingested documents as context."""
+        
+        response = await self._chat(
+            messages=self._trend_update_messages(industry, previous, context, time_period),
+            priority=priority,
+            response_format={"type": "json_object"},
+            temperature=0.7
         )
         
-        return response.data[0].embedding
+        result = json.loads(response.choices[0].message.content)
+        return result
+    
+    @timed("llm.stream_trends")
+    async def stream_trends(
+        self, 
+        industry: str, 
+        context: str,
+        time_period: str = "current"
+    ) -> AsyncIterator[str]:
+        """Stream the raw JSON text of a trend analysis as it is generated."""
+        
+        async with self._chat_stream(
+            messages=self._trend_messages(industry, context, time_period),
+            response_format={"type": "json_object"},
+            temperature=0.7
+        ) as stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    @timed("llm.generate_embedding")
+    async def generate_embedding(
+        self,
+        text: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> np.ndarray:
+        """Generate embeddings for text using OpenAI."""
+        
+        embeddings = await self.generate_embeddings([text], priority=priority)
+        return embeddings[0]
+    
+    @timed("llm.generate_embeddings")
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        priority: Priority = Priority.INTERACTIVE
+    ) -> List[np.ndarray]:
+        """Generate embeddings for many texts using multi-input requests.
+        
+        Cached vectors are served locally; only unseen texts are sent to the
+        API, each at most once per call. Batches are scheduled concurrently
+        in ``priority``'s lane of the embeddings rate limiter. Vectors are
+        float32 arrays, decoded straight from the API's base64 encoding.
+        """
+        
+        keys = [cache_key(self.embedding_model, text) for text in texts]
+        cached = await self.embedding_cache.get_many(keys) if self.embedding_cache.enabled else {}
+        
+        # Deduplicate misses so repeated texts cost one input
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+        
+        fetched: Dict[str, np.ndarray] = {}
+        pending_keys = list(pending)
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        
+        async def embed_batch(batch_keys: List[str]):
+            inputs = [pending[key] for key in batch_keys]
+            response = await self.embedding_limiter.run(
+                lambda: self.client.embeddings.create(
+                    model=self.embedding_model, input=inputs, encoding_format="base64"
+                ),
+                tokens=sum(count_tokens(text, self.embedding_model) for text in inputs),
+                priority=priority
+            )
+            record_usage(self.embedding_model, getattr(response, "usage", None))
+            # Results carry their input position; don't rely on response order
+            for item in response.data:
+                fetched[batch_keys[item.index]] = as_vector(item.embedding)
+        
+        await asyncio.gather(*[
+            embed_batch(pending_keys[start:start + batch_size])
+            for start in range(0, len(pending_keys), batch_size)
+        ])
+        
+        if fetched and self.embedding_cache.enabled:
+            await self.embedding_cache.put_many(fetched)
+        
+        return [cached[key] if key in cached else fetched[key] for key in keys]
     
+    @timed("llm.summarize_document")
     async def summarize_document(self, content: str, max_words: int = 200) -> str:
         """Summarize document content."""
         
@@ -111,8 +380,7 @@ Focus on data-driven insights and actionable predictions."""
 
 Summary:"""
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
+        response = await self._chat(
             messages=[
                 {"role": "system", "content": "You are a professional summarizer."},
                 {"role": "user", "content": prompt}
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+from typing import Dict, List, Union
+import asyncio
+import base64
+import hashlib
+import json
+import numpy as np
+
+# One document that satisfies both the SWOT and the trend response schema
+ANALYSIS_RESPONSE = {
+    "strengths": ["Strong brand", "Scale advantages"],
+    "weaknesses": ["High costs"],
+    "opportunities": ["Emerging markets"],
+    "threats": ["New entrants"],
+    "summary": "Offline analysis generated without calling OpenAI.",
+    "recommendations": ["Invest in R&D"],
+    "emerging_trends": [
+        {"trend": "Electrification", "description": "Rapid adoption", "impact": "high"}
+    ],
+    "declining_trends": [
+        {"trend": "Legacy platforms", "description": "Shrinking share", "impact": "medium"}
+    ],
+    "key_insights": ["Demand is growing"],
+    "predictions": ["Consolidation within two years"]
+}
+
+
+def fake_embedding(text: str, dimension: int) -> np.ndarray:
+    """Deterministic float32 unit vector for ``text``; equal texts get equal vectors."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class OfflineEmbeddings:
+    """Stand-in for ``AsyncOpenAI().embeddings`` with optional latency."""
+
+    def __init__(self, dimension: int, latency: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency
+
+    async def create(self, model: str, input: Union[str, List[str]], encoding_format: str = "float", **kwargs):
+        inputs = [input] if isinstance(input, str) else input
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        tokens = sum(len(text.split()) for text in inputs)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(
+                    index=i,
+                    embedding=self._encode(fake_embedding(text, self.dimension), encoding_format)
+                )
+                for i, text in enumerate(inputs)
+            ],
+            usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens)
+        )
+
+    @staticmethod
+    def _encode(vector: np.ndarray, encoding_format: str):
+        # Match the API: base64 of little-endian float32, or a list of floats
+        if encoding_format == "base64":
+            return base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii")
+        return vector.tolist()
+
+
+class OfflineChatCompletions:
+    """Stand-in for ``AsyncOpenAI().chat.completions`` with optional latency.
+
+    Always answers with ``ANALYSIS_RESPONSE``; streamed responses spread the
+    latency evenly across their chunks.
+    """
+
+    def __init__(self, latency: float = 0.0, chunk_chars: int = 16):
+        self.latency = latency
+        self.chunk_chars = chunk_chars
+
+    async def create(self, model: str, messages: List[Dict], stream: bool = False, **kwargs):
+        content = json.dumps(ANALYSIS_RESPONSE)
+        prompt_tokens = sum(len(message["content"].split()) for message in messages)
+        completion_tokens = len(content.split())
+
+        if stream:
+            return self._stream(content)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
+
+    async def _stream(self, content: str):
+        pieces = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+        for piece in pieces:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(pieces))
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))],
+                usage=None
+            )
+
+
+class OfflineOpenAI:
+    """Stand-in for the ``AsyncOpenAI`` client used by ``LLMService``."""
+
+    def __init__(self, dimension: int, latency: float = 0.0, chat_latency: float = 0.0):
+        self.embeddings = OfflineEmbeddings(dimension, latency)
+        self.chat = SimpleNamespace(completions=OfflineChatCompletions(chat_latency))
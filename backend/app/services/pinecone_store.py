@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+import numpy as np
+from app.services.vector_store import VectorStore
+
+
+class PineconeVectorStore(VectorStore):
+    """Vector store backed by a Pinecone serverless index.
+
+    The SDK is imported and the client built in ``initialize``, which runs
+    on the vector executor, not at construction time. The client takes
+    lists of floats, so vectors are converted only at this boundary.
+    """
+
+    def __init__(self, api_key: str, index_name: str, region: str, dimension: int):
+        self.api_key = api_key
+        self.pc = None
+        self.index_name = index_name
+        self.region = region
+        self.dimension = dimension
+        self.index = None
+
+    def initialize(self):
+        """Initialize Pinecone index."""
+        from pinecone import Pinecone, ServerlessSpec
+
+        if self.pc is None:
+            self.pc = Pinecone(api_key=self.api_key)
+
+        # Check if index exists
+        existing_indexes = self.pc.list_indexes()
+
+        if self.index_name not in [idx.name for idx in existing_indexes]:
+            # Create index if it doesn't exist
+            self.pc.create_index(
+                name=self.index_name,
+                dimension=self.dimension,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region=self.region
+                )
+            )
+            print(f"✅ Created Pinecone index: {self.index_name}")
+
+        self.index = self.pc.Index(self.index_name)
+        print(f"✅ Connected to Pinecone index: {self.index_name}")
+
+    def upsert(self, vectors: List[Dict]):
+        self.index.upsert(vectors=[
+            {**vector, "values": np.asarray(vector["values"], dtype=np.float32).tolist()}
+            for vector in vectors
+        ])
+
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int,
+        filter: Optional[Dict] = None
+    ) -> List[Dict]:
+        results = self.index.query(
+            vector=np.asarray(vector, dtype=np.float32).tolist(),
+            top_k=top_k,
+            include_metadata=True,
+            filter=filter
+        )
+        return [
+            {"id": match.id, "score": match.score, "metadata": match.metadata or {}}
+            for match in results.matches
+        ]
+
+    def fetch(self, ids: List[str]) -> List[Dict]:
+        response = self.index.fetch(ids=ids)
+        return [
+            {"id": vector.id, "values": np.asarray(vector.values, dtype=np.float32), "metadata": vector.metadata or {}}
+            for vector in response.vectors.values()
+        ]
+
+    def delete(self, ids: List[str]):
+        self.index.delete(ids=ids)
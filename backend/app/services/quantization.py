@@ -0,0 +1,47 @@
+from typing import Tuple
+import base64
+import numpy as np
+
+DTYPE = np.dtype("<f4")
+QUANTIZATIONS = ("none", "int8")
+
+
+def as_vector(values) -> np.ndarray:
+    """An embedding as a 1-D float32 array.
+
+    Accepts the embeddings API's base64 encoding, a list of floats or an
+    array; float32 arrays are returned without copying.
+    """
+    if isinstance(values, str):
+        return np.frombuffer(base64.b64decode(values), dtype=DTYPE)
+    return np.asarray(values, dtype=np.float32)
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and the float32 scale of each row."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def encode(vector: np.ndarray, quantization: str = "none") -> bytes:
+    """Pack one vector for storage; int8 keeps its scale in the last 4 bytes."""
+    if quantization == "int8":
+        codes, scales = quantize_int8(vector)
+        return codes.tobytes() + scales.astype(DTYPE).tobytes()
+    return np.asarray(vector, dtype=DTYPE).tobytes()
+
+
+def decode(blob: bytes, quantization: str = "none") -> np.ndarray:
+    """Unpack a vector written by ``encode`` into a new float32 array."""
+    if quantization == "int8":
+        codes = np.frombuffer(blob, dtype=np.int8, count=len(blob) - 4)
+        scale = np.frombuffer(blob, dtype=DTYPE, offset=len(blob) - 4)
+        return dequantize_int8(codes[None, :], scale)[0]
+    return np.frombuffer(blob, dtype=DTYPE).astype(np.float32)
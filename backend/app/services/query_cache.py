@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+import copy
+import itertools
+import json
+import time
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import QUERY_CACHE_SIMILARITY
+
+
+def filter_key(filter_dict: Optional[Dict]) -> str:
+    return json.dumps(filter_dict or {}, sort_keys=True, default=str)
+
+
+def filter_industries(filter_dict: Optional[Dict]) -> Optional[Set[str]]:
+    """Industries a filter is limited to, or None if it can match any industry."""
+    condition = (filter_dict or {}).get("industry")
+    if isinstance(condition, str):
+        return {condition}
+    if isinstance(condition, dict):
+        if isinstance(condition.get("$eq"), str):
+            return {condition["$eq"]}
+        if isinstance(condition.get("$in"), list):
+            return set(condition["$in"])
+    return None
+
+
+class _FilterGroup:
+    """Cached queries sharing one filter, with their embeddings stacked for search."""
+
+    def __init__(self, filter_dict: Optional[Dict]):
+        self.industries = filter_industries(filter_dict)
+        self.entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[int] = []
+
+    def add(self, entry_id: int, entry: Dict):
+        self.entries[entry_id] = entry
+        self._matrix = None
+
+    def remove(self, entry_id: int):
+        del self.entries[entry_id]
+        self._matrix = None
+
+    def nearest(self, query: np.ndarray, top_k: int, min_created: float):
+        """Most similar live entry holding at least ``top_k`` results."""
+        if self._matrix is None:
+            self._ids = list(self.entries)
+            self._matrix = np.stack([self.entries[i]["vector"] for i in self._ids])
+
+        scores = self._matrix @ query
+        for position in np.argsort(-scores):
+            entry = self.entries[self._ids[position]]
+            if entry["top_k"] >= top_k and entry["created"] >= min_created:
+                return self._ids[position], float(scores[position])
+        return None, 0.0
+
+
+class QueryCache:
+    """Reuse vector search results for near-duplicate queries.
+
+    Recent query embeddings are kept per ``filter_dict``. A new query whose
+    embedding is within ``threshold`` cosine similarity of a cached one, with
+    the same filter and no larger ``top_k``, gets the cached matches without
+    a vector store round-trip. Upserts invalidate entries whose filter could
+    include the changed industries. The cache is per process, so writes from
+    other processes only show up after ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 1000, threshold: float = 0.95, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._groups: Dict[str, _FilterGroup] = {}
+        self._order: "OrderedDict[int, str]" = OrderedDict()  # LRU of entry id -> filter key
+        self._ids = itertools.count()
+        self.generation = 0  # Bumped on every invalidation
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def get(self, embedding: np.ndarray, top_k: int, filter_dict: Optional[Dict] = None) -> Optional[List[Dict]]:
+        """Cached results for a near-identical query, or None."""
+        group = self._groups.get(filter_key(filter_dict))
+        entry_id, similarity = None, 0.0
+        if group is not None:
+            entry_id, similarity = group.nearest(
+                self._normalize(embedding), top_k, time.monotonic() - self.ttl_seconds
+            )
+            if entry_id is not None and settings.METRICS_ENABLED:
+                QUERY_CACHE_SIMILARITY.observe(similarity)
+
+        if entry_id is None or similarity < self.threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._order.move_to_end(entry_id)
+        # Callers own their results; don't hand out the cached objects
+        return copy.deepcopy(group.entries[entry_id]["results"][:top_k])
+
+    def put(
+        self,
+        embedding: np.ndarray,
+        top_k: int,
+        filter_dict: Optional[Dict],
+        results: List[Dict],
+        generation: int
+    ):
+        """Remember the results of a vector search.
+
+        ``generation`` is the value read before the search started; results
+        that raced an invalidation may predate the write and are dropped.
+        """
+        if not self.enabled or generation != self.generation:
+            return
+        key = filter_key(filter_dict)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _FilterGroup(filter_dict)
+
+        entry_id = next(self._ids)
+        group.add(entry_id, {
+            "vector": self._normalize(embedding),
+            "top_k": top_k,
+            "results": copy.deepcopy(results),
+            "created": time.monotonic()
+        })
+        self._order[entry_id] = key
+        while len(self._order) > self.max_entries:
+            self._drop(*self._order.popitem(last=False))
+            self.evictions += 1
+
+    def _drop(self, entry_id: int, key: str):
+        group = self._groups[key]
+        group.remove(entry_id)
+        if not group.entries:
+            del self._groups[key]
+
+    def invalidate(self, industries: Iterable[str]):
+        """Forget cached searches that could return documents from ``industries``."""
+        changed = set(industries)
+        self.generation += 1
+        for key, group in list(self._groups.items()):
+            if group.industries is None or group.industries & changed:
+                for entry_id in group.entries:
+                    del self._order[entry_id]
+                del self._groups[key]
+                self.invalidations += 1
+
+    def clear(self):
+        self.generation += 1
+        self._groups.clear()
+        self._order.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "threshold": self.threshold,
+            "entries": len(self._order),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
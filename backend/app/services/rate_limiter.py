@@ -0,0 +1,252 @@
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import contextlib
+import heapq
+import itertools
+import random
+import sys
+import time
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; lower values are served first."""
+    INTERACTIVE = 0  # User-facing search and analyses
+    BACKGROUND = 1  # Queued jobs
+    BULK = 2  # Ingestion and seeding
+
+
+class TokenBucket:
+    """Continuously refilling budget of ``per_minute`` units.
+
+    Takes may drive the level negative, so a request larger than the bucket
+    still goes through once the bucket is full and later callers pay it back.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, scale: float = 1.0):
+        now = time.monotonic()
+        rate = self.capacity * scale / 60
+        self.level = min(self.capacity, self.level + (now - self._updated) * rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, scale: float = 1.0) -> float:
+        """Seconds until ``amount`` (capped at capacity) can be taken."""
+        self.refill(scale)
+        needed = min(amount, self.capacity) - self.level
+        return 0.0 if needed <= 0 else needed * 60 / (self.capacity * scale)
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def give(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+    def drain(self):
+        self.level = min(self.level, 0.0)
+
+
+def is_rate_limit(error: Exception) -> bool:
+    # The SDK is imported with the client; without it no error can be an SDK error
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(error, openai.RateLimitError)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors and connection failures are worth retrying."""
+    openai = sys.modules.get("openai")
+    if openai is None:
+        return False
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Server-suggested delay in seconds, if the error response carries one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class RateLimiter:
+    """Request and token-per-minute scheduler for one API quota.
+
+    Callers wait in priority lanes and are admitted, highest priority first,
+    once both buckets can cover them and a concurrency slot is free. A 429
+    pauses admission, halves the refill rate and drains the buckets; each
+    success recovers the rate additively, so throughput settles just under
+    the real quota. Failed calls are retried with jittered exponential
+    backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.scale = 1.0
+        self._waiters: List = []  # Heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.counters = {"requests": 0, "retries": 0, "throttled": 0, "failures": 0}
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Any:
+        """Run ``call`` within the quota, retrying transient failures.
+
+        ``tokens`` is the estimated cost; if the response reports its usage,
+        the difference is settled with the token bucket.
+        """
+        result = await self._admit(call, tokens, priority)
+        self._release()
+        return result
+
+    @contextlib.asynccontextmanager
+    async def hold(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[Any]:
+        """Like ``run``, but keep the concurrency slot until the block exits.
+
+        For streamed responses, whose request is still running after
+        ``call`` returns the stream.
+        """
+        result = await self._admit(call, tokens, priority)
+        try:
+            yield result
+        finally:
+            self._release()
+
+    async def _admit(self, call: Callable[[], Awaitable[Any]], tokens: int, priority: Priority) -> Any:
+        """Run ``call`` with retries; returns holding the slot it succeeded in."""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(tokens, priority)
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                # E.g. a streaming client disconnecting
+                self._release()
+                raise
+            except Exception as e:
+                self._release()
+                if is_rate_limit(e):
+                    self._throttle(e)
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.counters["failures"] += 1
+                    raise
+                self.counters["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, e))
+                continue
+
+            self.counters["requests"] += 1
+            self.scale = min(1.0, self.scale + 0.05)
+            usage = getattr(result, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.tokens.give(tokens - usage.total_tokens)
+            return result
+
+    def stats(self) -> Dict:
+        """Queue depth per lane plus admission and retry counters."""
+        lanes = {lane.name.lower(): 0 for lane in Priority}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                lanes[Priority(priority).name.lower()] += 1
+        return {
+            "queued": lanes,
+            "in_flight": self._in_flight,
+            "rate_scale": round(self.scale, 3),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "requests_available": int(self.requests.level),
+            "tokens_available": int(self.tokens.level),
+            **self.counters
+        }
+
+    async def _acquire(self, tokens: int, priority: Priority):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Admitted just as the caller gave up
+            self._dispatch()
+            raise
+
+    def _release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiters in priority order until one has to wait."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)  # Cancelled while queued
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return  # _release will dispatch again
+
+            delay = max(
+                self._paused_until - time.monotonic(),
+                self.requests.wait_time(1, self.scale),
+                self.tokens.wait_time(tokens, self.scale)
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _throttle(self, error: Exception):
+        self.counters["throttled"] += 1
+        self.scale = max(0.1, self.scale / 2)
+        self.requests.drain()
+        self.tokens.drain()
+        pause = retry_after(error)
+        if pause:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return max(retry_after(error) or 0.0, random.uniform(0, ceiling))
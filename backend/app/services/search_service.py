@@ -0,0 +1,90 @@
+from typing import Dict, List
+from app.core.config import settings
+from app.services.lexical_index import lexical_index
+from app.services.vector_service import vector_service
+
+SEARCH_MODES = ("semantic", "lexical", "hybrid")
+
+
+class LexicalIndexUnavailable(RuntimeError):
+    """The keyword index is disabled or still loading."""
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[Dict]], k: int) -> List[Dict]:
+    """Merge ranked result lists by summing ``1 / (k + rank)`` per document.
+
+    Rank fusion needs no score calibration between BM25 and cosine
+    similarity. Each fused result keeps the fields of its first ranking
+    (so semantic matches keep their chunk text) and records every ranker's
+    raw score under ``scores``.
+    """
+    fused: Dict[str, Dict] = {}
+    for ranker, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            doc_id = result["metadata"].get("doc_id", result["id"])
+            entry = fused.setdefault(doc_id, {**result, "score": 0.0, "scores": {}})
+            entry["score"] += 1.0 / (k + rank)
+            entry["scores"][ranker] = result["score"]
+    return sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+
+
+class SearchService:
+    """Document search by embedding similarity, BM25 keywords, or both."""
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_dict: Dict = None,
+        mode: str = "semantic"
+    ) -> List[Dict]:
+        """Search documents.
+
+        ``lexical`` answers from the in-memory index with no network call.
+        ``hybrid`` fuses both rankings and falls back to ``semantic`` while
+        the index is loading.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        if mode == "lexical":
+            if not lexical_index.ready:
+                raise LexicalIndexUnavailable("Keyword index is disabled or still loading")
+            return lexical_index.search(query, top_k, filter_dict)
+
+        if mode == "semantic" or not lexical_index.ready:
+            return await vector_service.search_similar(
+                query=query,
+                top_k=top_k,
+                filter_dict=filter_dict
+            )
+
+        candidates = max(top_k, settings.HYBRID_CANDIDATES)
+        semantic = await vector_service.search_similar(
+            query=query,
+            top_k=candidates,
+            filter_dict=filter_dict
+        )
+        fused = reciprocal_rank_fusion(
+            {
+                "semantic": self._best_chunk_per_document(semantic),
+                "lexical": lexical_index.search(query, candidates, filter_dict)
+            },
+            settings.HYBRID_RRF_K
+        )
+        return fused[:top_k]
+
+    @staticmethod
+    def _best_chunk_per_document(results: List[Dict]) -> List[Dict]:
+        """Keep each document's highest-scoring chunk, so ranks are per document."""
+        seen = set()
+        best = []
+        for result in results:
+            doc_id = result["metadata"].get("doc_id", result["id"])
+            if doc_id not in seen:
+                seen.add(doc_id)
+                best.append(result)
+        return best
+
+
+search_service = SearchService()
@@ -0,0 +1,287 @@
+from beanie import PydanticObjectId
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+from app.core.config import settings
+from app.models.analysis import TrendAnalysis, TrendSnapshot
+from app.models.document import Document, DocumentText
+from app.services.analysis_cache import analysis_cache
+from app.services.chunking import count_tokens
+from app.services.context_packer import SEPARATOR, context_packer
+from app.services.llm_service import llm_service
+
+# Builds an unsaved analysis for (industry, time_period) from full RAG context
+FullBuild = Callable[[str, str], Awaitable[TrendAnalysis]]
+
+# (updated_at, _id) of the last document a snapshot has read; bulk writes share updated_at
+Watermark = Tuple[Optional[datetime], Optional[PydanticObjectId]]
+
+ANALYSIS_FIELDS = ("emerging_trends", "declining_trends", "summary", "key_insights", "predictions")
+
+
+class TrendSnapshots:
+    """Materialized trend analyses per ``(industry, time_period)``.
+
+    A snapshot is created the first time a trend analysis is requested with
+    ``snapshot=true`` and is then kept current in the background. It is
+    refreshed once ``TREND_SNAPSHOT_MIN_NEW_DOCUMENTS`` documents arrived
+    since it was built, or once any did and it is older than
+    ``TREND_SNAPSHOT_MAX_AGE_SECONDS``. A refresh sends the LLM the previous
+    analysis plus only the new documents, oldest first, in as many rounds
+    as it takes to fit them all into the RAG context budget; more than
+    ``TREND_SNAPSHOT_DELTA_DOCUMENTS`` of them trigger a full rebuild
+    instead. A lease keeps workers from refreshing the same snapshot.
+    """
+
+    def __init__(self):
+        self._build: Optional[FullBuild] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = {"delta": 0, "full": 0, "failed": 0}
+
+    def register(self, build: FullBuild):
+        """Set how snapshots are rebuilt from scratch."""
+        self._build = build
+
+    async def get(self, industry: str, time_period: str) -> Optional[Tuple[TrendSnapshot, TrendAnalysis]]:
+        """The current snapshot and its analysis, or None."""
+        snapshot = await TrendSnapshot.find_one({"industry": industry, "time_period": time_period})
+        if snapshot is None:
+            return None
+        analysis = await TrendAnalysis.get(snapshot.analysis_id)
+        return (snapshot, analysis) if analysis else None
+
+    async def watermark(self, industry: str) -> Watermark:
+        """Position of the industry's most recently written document."""
+        latest = await Document.find(
+            {"industry": industry}
+        ).sort("-updated_at", "-_id").project(DocumentText).first_or_none()
+        return (latest.updated_at, latest.id) if latest else (None, None)
+
+    async def track(
+        self,
+        industry: str,
+        time_period: str,
+        analysis: TrendAnalysis,
+        watermark: Watermark
+    ) -> TrendSnapshot:
+        """Start keeping ``analysis`` current; an existing snapshot wins."""
+        raw = await TrendSnapshot.get_motor_collection().find_one_and_update(
+            {"industry": industry, "time_period": time_period},
+            {"$setOnInsert": {
+                "analysis_id": analysis.id,
+                "watermark": watermark[0],
+                "watermark_id": watermark[1],
+                "refreshed_at": analysis.created_at,
+                "refreshes": 0,
+                "lease_until": None
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return TrendSnapshot.model_validate(raw)
+
+    def _pending_query(self, industry: str, watermark: Watermark) -> Dict:
+        query: Dict = {"industry": industry}
+        updated_at, document_id = watermark
+        if updated_at is not None:
+            after = [{"updated_at": {"$gt": updated_at}}]
+            if document_id is not None:
+                after.append({"updated_at": updated_at, "_id": {"$gt": document_id}})
+            query["$or"] = after
+        return query
+
+    @staticmethod
+    def _position(snapshot: TrendSnapshot) -> Watermark:
+        return snapshot.watermark, snapshot.watermark_id
+
+    def _due(self, snapshot: TrendSnapshot, pending: int) -> bool:
+        if pending >= settings.TREND_SNAPSHOT_MIN_NEW_DOCUMENTS:
+            return True
+        age = (datetime.utcnow() - snapshot.refreshed_at).total_seconds()
+        return pending > 0 and age >= settings.TREND_SNAPSHOT_MAX_AGE_SECONDS
+
+    async def _claim(self, snapshot: TrendSnapshot) -> Optional[TrendSnapshot]:
+        now = datetime.utcnow()
+        raw = await TrendSnapshot.get_motor_collection().find_one_and_update(
+            {
+                "_id": snapshot.id,
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]
+            },
+            {"$set": {"lease_until": now + timedelta(seconds=settings.TREND_SNAPSHOT_LEASE_SECONDS)}},
+            return_document=ReturnDocument.AFTER
+        )
+        return TrendSnapshot.model_validate(raw) if raw else None
+
+    async def refresh(self, snapshot: TrendSnapshot) -> bool:
+        """Refresh one snapshot if it is due; returns whether it was."""
+        pending_query = self._pending_query(snapshot.industry, self._position(snapshot))
+        if not self._due(snapshot, await Document.find(pending_query).count()):
+            return False
+        snapshot = await self._claim(snapshot)
+        if snapshot is None:
+            return False  # Another worker is on it
+
+        collection = TrendSnapshot.get_motor_collection()
+        try:
+            # Re-check against the claimed state; the holder before us may have refreshed it
+            pending_query = self._pending_query(snapshot.industry, self._position(snapshot))
+            pending = await Document.find(pending_query).count()
+            if not self._due(snapshot, pending):
+                await collection.update_one({"_id": snapshot.id}, {"$set": {"lease_until": None}})
+                return False
+
+            previous = await TrendAnalysis.get(snapshot.analysis_id)
+            if previous is None or pending > settings.TREND_SNAPSHOT_DELTA_DOCUMENTS:
+                watermark = await self.watermark(snapshot.industry)
+                analysis = await self._build(snapshot.industry, snapshot.time_period)
+                kind = "full"
+            else:
+                # Fold the new documents in oldest first until none are left;
+                # each round takes at least one, so later arrivals can't keep it going
+                analysis, watermark = previous, self._position(snapshot)
+                for _ in range(pending):
+                    analysis, watermark, remaining = await self._update(snapshot, analysis, watermark)
+                    await self._renew(snapshot)
+                    if not remaining:
+                        break
+                kind = "delta"
+                if analysis is previous:
+                    await collection.update_one({"_id": snapshot.id}, {"$set": {"lease_until": None}})
+                    return False  # The pending documents were deleted meanwhile
+            await analysis.insert()
+        except Exception:
+            self.refreshes["failed"] += 1
+            await collection.update_one({"_id": snapshot.id}, {"$set": {"lease_until": None}})
+            raise
+
+        await collection.update_one(
+            {"_id": snapshot.id},
+            {
+                "$set": {
+                    "analysis_id": analysis.id,
+                    "watermark": watermark[0],
+                    "watermark_id": watermark[1],
+                    "refreshed_at": analysis.created_at,
+                    "lease_until": None
+                },
+                "$inc": {"refreshes": 1}
+            }
+        )
+        self.refreshes[kind] += 1
+        return True
+
+    async def _renew(self, snapshot: TrendSnapshot):
+        await TrendSnapshot.get_motor_collection().update_one(
+            {"_id": snapshot.id},
+            {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=settings.TREND_SNAPSHOT_LEASE_SECONDS)}}
+        )
+
+    @staticmethod
+    def _passage(document: DocumentText) -> str:
+        return f"{document.title}\n{document.content}"
+
+    def _fit(self, documents: List[DocumentText]) -> List[DocumentText]:
+        """The oldest documents that all fit the RAG context budget; at least one."""
+        separator = count_tokens(SEPARATOR, context_packer.model)
+        used = 0
+        for count, document in enumerate(documents):
+            cost = min(
+                count_tokens(self._passage(document), context_packer.model),
+                settings.RAG_PASSAGE_MAX_TOKENS
+            ) + (separator if count else 0)
+            if count and used + cost > settings.RAG_CONTEXT_TOKENS:
+                return documents[:count]
+            used += cost
+        return documents
+
+    async def _update(
+        self,
+        snapshot: TrendSnapshot,
+        previous: TrendAnalysis,
+        watermark: Watermark
+    ) -> Tuple[TrendAnalysis, Watermark, bool]:
+        """Fold the oldest documents after ``watermark`` that fit one context into ``previous``.
+
+        Returns the updated analysis, the position of the last document folded
+        in, and whether more documents are pending after it.
+        """
+        documents: List[DocumentText] = await Document.find(
+            self._pending_query(snapshot.industry, watermark)
+        ).sort("+updated_at", "+_id").project(DocumentText).to_list()
+        if not documents:
+            return previous, watermark, False
+        batch = self._fit(documents)
+
+        # Everything in the batch fits; near-duplicates may still be dropped
+        corpus_version = await analysis_cache.corpus_version(snapshot.industry)
+        rag = context_packer.pack([
+            {
+                "id": str(document.id),
+                "score": len(batch) - position,
+                "text": self._passage(document),
+                "metadata": {"doc_id": str(document.id), "title": document.title, "source": document.source}
+            }
+            for position, document in enumerate(batch)
+        ])
+        analysis_data = await llm_service.update_trends(
+            industry=snapshot.industry,
+            previous={field: getattr(previous, field) for field in ANALYSIS_FIELDS},
+            context=rag["context"],
+            time_period=snapshot.time_period
+        )
+
+        new_ids = [passage["metadata"]["doc_id"] for passage in rag["passages"]]
+        analysis = TrendAnalysis(
+            industry=snapshot.industry,
+            time_period=snapshot.time_period,
+            emerging_trends=analysis_data["emerging_trends"],
+            declining_trends=analysis_data.get("declining_trends", []),
+            summary=analysis_data["summary"],
+            key_insights=analysis_data["key_insights"],
+            predictions=analysis_data.get("predictions", []),
+            source_documents=list(dict.fromkeys(new_ids + previous.source_documents)),
+            context_tokens=rag["tokens"],
+            request_hash=previous.request_hash,
+            corpus_version=corpus_version
+        )
+        last = batch[-1]
+        return analysis, (last.updated_at, last.id), len(batch) < len(documents)
+
+    async def refresh_due(self) -> int:
+        """Refresh every snapshot that is due; returns how many were."""
+        refreshed = 0
+        for snapshot in await TrendSnapshot.find_all().to_list():
+            try:
+                if await self.refresh(snapshot):
+                    refreshed += 1
+            except Exception as e:
+                print(f"❌ Error refreshing trend snapshot {snapshot.industry}/{snapshot.time_period}: {e}")
+        return refreshed
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.TREND_SNAPSHOT_INTERVAL_SECONDS)
+            try:
+                await self.refresh_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Error checking trend snapshots: {e}")
+
+    async def start(self):
+        """Check snapshots every ``TREND_SNAPSHOT_INTERVAL_SECONDS``."""
+        if settings.TREND_SNAPSHOT_INTERVAL_SECONDS > 0 and self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(), name="trend-snapshot-refresh")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {"running": self._task is not None, "refreshes": dict(self.refreshes)}
+
+
+trend_snapshots = TrendSnapshots()
@@ -1,47 +1,97 @@
-from pinecone import Pinecone, ServerlessSpec
 from app.core.config import settings
+from app.core.metrics import timed, track
+from app.core.singleflight import singleflight
+from app.services.chunking import chunk_text
 from app.services.llm_service import llm_service
-from typing import List, Dict
-import hashlib
+from app.services.query_cache import QueryCache
+from app.services.rate_limiter import Priority
+from app.services.vector_store import VectorStore, create_vector_store
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Dict, Optional
+import asyncio
+import numpy as np
 
 
 class VectorService:
-    """Service for vector database operations using Pinecone."""
+    """Service for vector database operations.
     
-    def __init__(self):
-        self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-        self.index_name = settings.PINECONE_INDEX_NAME
-        self.index = None
+    Storage is delegated to a ``VectorStore`` (Pinecone or local FAISS,
+    chosen by ``VECTOR_BACKEND``). The store is built and opened on first
+    use, so importing the app makes no network calls.
+    """
+    
+    def __init__(self, store: VectorStore = None):
+        self._store = store
+        self._init_lock = asyncio.Lock()
+        self.timeout = settings.VECTOR_TIMEOUT_SECONDS
+        self.query_cache = QueryCache(
+            max_entries=settings.QUERY_CACHE_SIZE,
+            threshold=settings.QUERY_CACHE_THRESHOLD,
+            ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS
+        )
+        # Store calls are synchronous; run them on a bounded pool so a slow
+        # round-trip never blocks the event loop.
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.VECTOR_MAX_CONCURRENCY,
+            thread_name_prefix="vector-store"
+        )
+    
+    @property
+    def store(self) -> VectorStore:
+        if self._store is None:
+            self._store = create_vector_store()
+        return self._store
+    
+    @store.setter
+    def store(self, store: VectorStore):
+        self._store = store
+    
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        with track(f"vector_store.{func.__name__}"):
+            future = loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            return await asyncio.wait_for(future, timeout=self.timeout)
+    
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking store call in the executor with a timeout."""
+        if not self.store.initialized:
+            await self.initialize()
+        return await self._call(func, *args, **kwargs)
     
     async def initialize(self):
-        """Initialize Pinecone index."""
-        try:
-            # Check if index exists
-            existing_indexes = self.pc.list_indexes()
-            
-            if self.index_name not in [idx.name for idx in existing_indexes]:
-                # Create index if it doesn't exist
-                self.pc.create_index(
-                    name=self.index_name,
-                    dimension=1536,  # OpenAI ada-002 embedding dimension
-                    metric="cosine",
-                    spec=ServerlessSpec(
-                        cloud="aws",
-                        region=settings.PINECONE_ENVIRONMENT
-                    )
-                )
-                print(f"✅ Created Pinecone index: {self.index_name}")
-            
-            self.index = self.pc.Index(self.index_name)
-            print(f"✅ Connected to Pinecone index: {self.index_name}")
-            
-        except Exception as e:
-            print(f"❌ Error initializing Pinecone: {e}")
-            raise
-    
-    def _generate_id(self, text: str) -> str:
-        """Generate unique ID for vector."""
-        return hashlib.md5(text.encode()).hexdigest()
+        """Open the vector store; concurrent and repeated calls share one attempt."""
+        async with self._init_lock:
+            if self.store.initialized:
+                return
+            try:
+                await self._call(self.store.initialize)
+            except Exception as e:
+                print(f"❌ Error initializing vector store: {e}")
+                raise
+    
+    def close(self):
+        """Persist local stores and release the worker threads."""
+        if self._store is not None:
+            self._store.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _chunk_id(self, doc_id: str, chunk_index: int) -> str:
+        """Generate the vector ID for one chunk of a document."""
+        return f"{doc_id}#{chunk_index}"
+    
+    @timed("vector.chunk_documents")
+    def _chunk_documents(self, documents: List[Dict]) -> List[List[Dict]]:
+        """Split each document's content into token-bounded chunks."""
+        return [
+            chunk_text(
+                doc["content"],
+                model=llm_service.embedding_model,
+                chunk_tokens=settings.CHUNK_SIZE_TOKENS,
+                overlap_tokens=settings.CHUNK_OVERLAP_TOKENS
+            )
+            for doc in documents
+        ]
     
     async def upsert_document(
         self, 
@@ -49,64 +99,184 @@ class VectorService:
         content: str, 
         metadata: Dict
     ) -> str:
-        """Store document embedding in vector database."""
+        """Store document chunk embeddings in vector database."""
+        
+        stored = await self.upsert_documents([
+            {"doc_id": doc_id, "content": content, "metadata": metadata}
+        ])
+        return stored[0]["embedding_id"]
+    
+    @timed("vector.upsert_documents")
+    async def upsert_documents(self, documents: List[Dict]) -> List[Dict]:
+        """Store chunk embeddings for many documents using batched calls.
         
-        # Generate embedding
-        embedding = await llm_service.generate_embedding(content)
+        Each item needs ``doc_id``, ``content`` and ``metadata``. Every chunk
+        becomes its own vector with ``doc_id``/``chunk_index`` metadata.
+        Returns each document's first chunk vector ID (``embedding_id``) and
+        ``chunk_count``, in input order.
+        """
         
-        # Generate unique vector ID
-        vector_id = self._generate_id(f"{doc_id}_{content[:100]}")
+        # Tokenizing long reports is CPU-bound; keep it off the event loop
+        chunked = await asyncio.to_thread(self._chunk_documents, documents)
         
-        # Upsert to Pinecone
-        self.index.upsert(
-            vectors=[
-                {
-                    "id": vector_id,
-                    "values": embedding,
+        # One multi-input embedding call per provider-sized batch; ingestion
+        # yields to interactive searches when the quota is tight
+        embeddings = iter(await llm_service.generate_embeddings(
+            [chunk["text"] for chunks in chunked for chunk in chunks],
+            priority=Priority.BULK
+        ))
+        
+        vectors = []
+        for doc, chunks in zip(documents, chunked):
+            for chunk in chunks:
+                vectors.append({
+                    "id": self._chunk_id(doc["doc_id"], chunk["index"]),
+                    "values": next(embeddings),
                     "metadata": {
-                        **metadata,
-                        "doc_id": doc_id,
-                        "content_preview": content[:200]
+                        **doc["metadata"],
+                        "doc_id": doc["doc_id"],
+                        "chunk_index": chunk["index"],
+                        "chunk_count": len(chunks),
+                        "text": chunk["text"],
+                        "content_preview": chunk["text"][:200]
                     }
-                }
-            ]
-        )
+                })
         
-        return vector_id
+        await self._upsert_batches(vectors)
+        self.query_cache.invalidate({doc["metadata"].get("industry") for doc in documents})
+        
+        return [
+            {"embedding_id": self._chunk_id(doc["doc_id"], 0), "chunk_count": len(chunks)}
+            for doc, chunks in zip(documents, chunked)
+        ]
+    
+    async def _upsert_batches(self, vectors: List[Dict]):
+        # Upsert batches concurrently; the executor bounds parallelism
+        batch_size = settings.VECTOR_UPSERT_BATCH_SIZE
+        await asyncio.gather(*[
+            self._run(self.store.upsert, vectors[start:start + batch_size])
+            for start in range(0, len(vectors), batch_size)
+        ])
+    
+    async def upsert_vectors(self, vectors: List[Dict]):
+        """Store precomputed vectors as-is, e.g. when restoring a snapshot."""
+        await self._upsert_batches(vectors)
+        self.query_cache.clear()
+    
+    async def fetch_vectors(self, vector_ids: List[str]) -> List[Dict]:
+        """Stored vectors (``id``, ``values``, ``metadata``) by ID using batched calls."""
+        batch_size = settings.VECTOR_FETCH_BATCH_SIZE
+        batches = await asyncio.gather(*[
+            self._run(self.store.fetch, vector_ids[start:start + batch_size])
+            for start in range(0, len(vector_ids), batch_size)
+        ])
+        return [vector for batch in batches for vector in batch]
     
+    @singleflight.coalesce("vector.search_similar")
+    @timed("vector.search_similar")
     async def search_similar(
         self, 
         query: str, 
         top_k: int = 5,
-        filter_dict: Dict = None
+        filter_dict: Dict = None,
+        priority: Priority = Priority.INTERACTIVE
     ) -> List[Dict]:
         """Search for similar documents using semantic search."""
         
         # Generate query embedding
-        query_embedding = await llm_service.generate_embedding(query)
-        
-        # Search in Pinecone
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True,
-            filter=filter_dict
+        query_embedding = await llm_service.generate_embedding(query, priority=priority)
+        
+        return await self.search_by_embedding(query_embedding, top_k, filter_dict)
+    
+    async def search_by_embedding(
+        self,
+        embedding: np.ndarray,
+        top_k: int = 5,
+        filter_dict: Dict = None
+    ) -> List[Dict]:
+        """Search with a precomputed query embedding, e.g. from a batched call.
+        
+        Near-duplicates of recent queries with the same filter are answered
+        from ``query_cache`` without a vector store round-trip.
+        """
+        
+        cache = self.query_cache
+        if cache.enabled:
+            cached = cache.get(embedding, top_k, filter_dict)
+            if cached is not None:
+                return cached
+        generation = cache.generation
+        
+        # Search the vector store
+        matches = await self._run(
+            self.store.query,
+            embedding,
+            top_k,
+            filter_dict
         )
         
         # Format results
         similar_docs = []
-        for match in results.matches:
+        for match in matches:
+            metadata = match["metadata"]
             similar_docs.append({
-                "id": match.id,
-                "score": match.score,
-                "metadata": match.metadata
+                "id": match["id"],
+                "score": match["score"],
+                # Matched chunk text; older whole-document vectors only have a preview
+                "text": metadata.get("text") or metadata.get("content_preview", ""),
+                "metadata": metadata
             })
         
+        cache.put(embedding, top_k, filter_dict, similar_docs, generation)
         return similar_docs
     
+    def document_vector_ids(
+        self,
+        doc_id: str,
+        chunk_count: Optional[int],
+        embedding_id: Optional[str]
+    ) -> List[str]:
+        """IDs of every vector stored for a document."""
+        
+        return self.stale_vector_ids(doc_id, 0, chunk_count, embedding_id)
+    
+    def stale_vector_ids(
+        self,
+        doc_id: str,
+        chunk_count: int,
+        previous_chunk_count: Optional[int],
+        previous_embedding_id: Optional[str]
+    ) -> List[str]:
+        """IDs left behind when a re-embedded document now has ``chunk_count`` chunks."""
+        
+        stale = [self._chunk_id(doc_id, i) for i in range(chunk_count, previous_chunk_count or 0)]
+        # Vectors from before chunking used a content hash as their ID
+        if previous_embedding_id and not previous_embedding_id.startswith(f"{doc_id}#"):
+            stale.append(previous_embedding_id)
+        return stale
+    
     async def delete_document(self, vector_id: str):
         """Delete document from vector database."""
-        self.index.delete(ids=[vector_id])
+        await self._run(self.store.delete, [vector_id])
+        self.query_cache.clear()
+    
+    async def delete_vectors(self, vector_ids: List[str], industries: Iterable[str] = None):
+        """Delete many vectors using batched calls.
+        
+        ``industries`` limits query cache invalidation to searches that could
+        have returned these vectors; without it the whole cache is dropped.
+        """
+        if not vector_ids:
+            return
+        batch_size = settings.VECTOR_UPSERT_BATCH_SIZE
+        await asyncio.gather(*[
+            self._run(self.store.delete, vector_ids[start:start + batch_size])
+            for start in range(0, len(vector_ids), batch_size)
+        ])
+        if industries is None:
+            self.query_cache.clear()
+        else:
+            self.query_cache.invalidate(industries)
 
 
 vector_service = VectorService()
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+import json
+import os
+import shutil
+import numpy as np
+from app.core.config import settings
+from app.models.document import Document, DocumentFingerprint
+from app.services.vector_service import vector_service
+
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+VECTORS = "vectors.f32"  # Row-major little-endian float32, ``count`` x ``dimension``
+METADATA = "metadata.jsonl"  # One {"id", "metadata"} line per vector row
+
+DTYPE = np.dtype("<f4")
+
+
+class VectorSnapshot:
+    """A vector store snapshot on disk, read without loading it into memory.
+
+    A snapshot is a directory holding ``manifest.json``, the vectors as a
+    raw float32 matrix that is memory-mapped on read, and a row-aligned
+    JSONL metadata table.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported vector snapshot version: {self.manifest.get('version')}")
+        self.count = self.manifest["count"]
+        self.dimension = self.manifest["dimension"]
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self.count == 0:
+            return np.empty((0, self.dimension), dtype=DTYPE)
+        return np.memmap(
+            os.path.join(self.path, VECTORS), dtype=DTYPE, mode="r", shape=(self.count, self.dimension)
+        )
+
+    def batches(self, batch_size: int) -> Iterator[List[Dict]]:
+        """Vectors as upsert-ready ``{"id", "values", "metadata"}`` dicts.
+
+        Each batch's rows are copied out of the memory map in one slice.
+        """
+        vectors = self.vectors
+        entries: List[Dict] = []
+        start = 0
+
+        def batch() -> List[Dict]:
+            rows = np.array(vectors[start:start + len(entries)], dtype=np.float32)
+            return [
+                {"id": entry["id"], "values": values, "metadata": entry["metadata"]}
+                for entry, values in zip(entries, rows)
+            ]
+
+        with open(os.path.join(self.path, METADATA)) as f:
+            for line in f:
+                entries.append(json.loads(line))
+                if len(entries) >= batch_size:
+                    yield batch()
+                    start += len(entries)
+                    entries = []
+        if entries:
+            yield batch()
+
+
+async def export_snapshot(path: str, batch_size: int = 1000) -> Dict:
+    """Write every vector referenced by a stored document to a snapshot at ``path``.
+
+    Vector IDs come from MongoDB (``embedding_id`` and ``chunk_count``),
+    which works for every backend, and are fetched ``batch_size`` at a time.
+    The snapshot is written beside ``path`` and swapped in when complete.
+    """
+    staging = f"{path}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    expected = written = 0
+    with open(os.path.join(staging, VECTORS), "wb") as vectors_file, \
+            open(os.path.join(staging, METADATA), "w") as metadata_file:
+
+        async def flush(ids: List[str]) -> int:
+            vectors = await vector_service.fetch_vectors(ids)
+            if not vectors:
+                return 0
+            matrix = np.asarray([vector["values"] for vector in vectors], dtype=DTYPE)
+            if matrix.shape[1] != settings.EMBEDDING_DIMENSION:
+                raise ValueError(
+                    f"Stored vectors have {matrix.shape[1]} dimensions, expected {settings.EMBEDDING_DIMENSION}"
+                )
+            vectors_file.write(matrix.tobytes())
+            metadata_file.writelines(
+                json.dumps({"id": vector["id"], "metadata": vector["metadata"]}, default=str) + "\n"
+                for vector in vectors
+            )
+            return len(vectors)
+
+        ids: List[str] = []
+        documents = Document.find(
+            {"embedding_id": {"$ne": None}}
+        ).project(DocumentFingerprint)
+        async for document in documents:
+            ids.extend(vector_service.document_vector_ids(
+                str(document.id), document.chunk_count, document.embedding_id
+            ))
+            if len(ids) >= batch_size:
+                expected += len(ids)
+                written += await flush(ids)
+                ids = []
+        if ids:
+            expected += len(ids)
+            written += await flush(ids)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "count": written,
+        "dimension": settings.EMBEDDING_DIMENSION,
+        "dtype": "float32",
+        "embedding_model": settings.EMBEDDING_MODEL,
+        "backend": settings.VECTOR_BACKEND,
+        "created_at": datetime.utcnow().isoformat(),
+        "missing": expected - written
+    }
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap in the complete snapshot; a crash leaves the old one or the staging copy
+    previous = f"{path}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, previous)
+    os.replace(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+async def import_snapshot(path: str, batch_size: int = 5000) -> Tuple[int, Dict]:
+    """Upsert a snapshot into the configured vector store; returns the count and manifest."""
+    snapshot = VectorSnapshot(path)
+    if snapshot.dimension != settings.EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"Snapshot has {snapshot.dimension} dimensions, EMBEDDING_DIMENSION is {settings.EMBEDDING_DIMENSION}"
+        )
+    if snapshot.manifest.get("embedding_model") != settings.EMBEDDING_MODEL:
+        print(
+            f"⚠️ Snapshot embeddings come from {snapshot.manifest.get('embedding_model')}, "
+            f"queries will use {settings.EMBEDDING_MODEL}"
+        )
+
+    restored = 0
+    for batch in snapshot.batches(batch_size):
+        await vector_service.upsert_vectors(batch)
+        restored += len(batch)
+    return restored, snapshot.manifest
@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+import numpy as np
+from app.core.config import settings
+
+
+def matches_filter(metadata: Dict, filter: Optional[Dict]) -> bool:
+    """Evaluate a Pinecone-style metadata filter against one metadata dict."""
+    if not filter:
+        return True
+
+    for field, condition in filter.items():
+        if field == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+        if field == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+
+        value = metadata.get(field)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+
+    return True
+
+
+class VectorStore(ABC):
+    """Backend-neutral interface for storing and querying vectors.
+
+    Methods are synchronous; ``VectorService`` runs them on its executor so
+    network-bound and CPU-bound backends share one non-blocking path.
+    Vectors are ``{"id", "values", "metadata"}`` dicts and query results are
+    ``{"id", "score", "metadata"}`` dicts ordered by descending score.
+    """
+
+    index = None  # Set by ``initialize``
+
+    @property
+    def initialized(self) -> bool:
+        return self.index is not None
+
+    @abstractmethod
+    def initialize(self):
+        """Create or open the underlying index."""
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict]):
+        """Insert vectors, replacing any with the same ID.
+
+        ``values`` are float32 arrays; backends convert them if their client
+        needs another type.
+        """
+
+    @abstractmethod
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int,
+        filter: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Return the ``top_k`` nearest vectors matching ``filter``."""
+
+    @abstractmethod
+    def fetch(self, ids: List[str]) -> List[Dict]:
+        """Return the stored vectors with these IDs as float32 arrays; unknown IDs are skipped."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]):
+        """Delete vectors by ID; unknown IDs are ignored."""
+
+    def close(self):
+        """Release resources and persist state if the backend is local."""
+
+
+def create_vector_store() -> VectorStore:
+    """Build the vector store selected by ``VECTOR_BACKEND``."""
+    backend = settings.VECTOR_BACKEND.lower()
+
+    if backend == "pinecone":
+        from app.services.pinecone_store import PineconeVectorStore
+        return PineconeVectorStore(
+            api_key=settings.PINECONE_API_KEY,
+            index_name=settings.PINECONE_INDEX_NAME,
+            region=settings.PINECONE_ENVIRONMENT,
+            dimension=settings.EMBEDDING_DIMENSION
+        )
+
+    if backend == "faiss":
+        from app.services.faiss_store import FaissVectorStore
+        return FaissVectorStore(
+            dimension=settings.EMBEDDING_DIMENSION,
+            index_type=settings.FAISS_INDEX_TYPE,
+            path=settings.FAISS_INDEX_PATH,
+            nlist=settings.FAISS_NLIST,
+            nprobe=settings.FAISS_NPROBE,
+            hnsw_m=settings.FAISS_HNSW_M,
+            ef_search=settings.FAISS_EF_SEARCH,
+            quantization=settings.FAISS_QUANTIZATION,
+            pq_m=settings.FAISS_PQ_M,
+            checkpoint_vectors=settings.FAISS_CHECKPOINT_VECTORS
+        )
+
+    raise ValueError(f"Unknown VECTOR_BACKEND: {settings.VECTOR_BACKEND}")
@@ -0,0 +1,116 @@
+"""
+Local stand-ins for Pinecone and MongoDB used by the offline benchmarks.
+
+OpenAI is replaced by ``app.services.offline.OfflineOpenAI``.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.vector_store import matches_filter
+
+
+class FakePineconeIndex:
+    """In-memory stand-in for ``pinecone.Index``.
+
+    Calls block for ``latency`` seconds, like the synchronous client's
+    network round-trip. Queries are exact cosine search over all vectors.
+    The vector store calls it from worker threads, so mutations are locked.
+    """
+
+    def __init__(self, dimension: int, latency: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency
+        self.ids: List[str] = []
+        self.metadata: List[Dict] = []
+        self.positions: Dict[str, int] = {}
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def upsert(self, vectors: List[Dict]):
+        self._wait()
+        with self._lock:
+            new_rows = []
+            for vector in vectors:
+                values = np.asarray(vector["values"], dtype=np.float32)
+                values /= np.linalg.norm(values) or 1.0
+                position = self.positions.get(vector["id"])
+                if position is None:
+                    position = self.positions[vector["id"]] = len(self.ids)
+                    self.ids.append(vector["id"])
+                    self.metadata.append(None)
+                    new_rows.append(values)
+                elif position >= len(self.vectors):
+                    new_rows[position - len(self.vectors)] = values
+                else:
+                    self.vectors[position] = values
+                self.metadata[position] = vector.get("metadata") or {}
+            if new_rows:
+                self.vectors = np.vstack([self.vectors, np.stack(new_rows)])
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        include_metadata: bool = True,
+        filter: Optional[Dict] = None
+    ):
+        self._wait()
+        with self._lock:
+            vectors, metadata, ids = self.vectors, list(self.metadata), list(self.ids)
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        candidates = [
+            position for position, entry in enumerate(metadata)
+            if entry is not None and matches_filter(entry, filter)
+        ]
+        if not candidates:
+            return SimpleNamespace(matches=[])
+
+        scores = vectors[candidates] @ query
+        best = np.argsort(-scores)[:top_k]
+        return SimpleNamespace(matches=[
+            SimpleNamespace(
+                id=ids[candidates[i]],
+                score=float(scores[i]),
+                metadata=metadata[candidates[i]] if include_metadata else None
+            )
+            for i in best
+        ])
+
+    def fetch(self, ids: List[str]):
+        self._wait()
+        with self._lock:
+            found = [(vector_id, self.positions[vector_id]) for vector_id in ids if vector_id in self.positions]
+            return SimpleNamespace(vectors={
+                vector_id: SimpleNamespace(
+                    id=vector_id,
+                    values=self.vectors[position].tolist(),
+                    metadata=self.metadata[position]
+                )
+                for vector_id, position in found
+            })
+
+    def delete(self, ids: List[str]):
+        self._wait()
+        with self._lock:
+            for vector_id in ids:
+                position = self.positions.pop(vector_id, None)
+                if position is not None:
+                    self.metadata[position] = None  # Tombstone; skipped by queries
+
+
+def fake_motor_client(*args, **kwargs):
+    """In-memory stand-in for ``AsyncIOMotorClient`` (requires mongomock-motor)."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    return AsyncMongoMockClient()
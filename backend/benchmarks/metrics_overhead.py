@@ -0,0 +1,106 @@
+"""
+Overhead of the metrics instrumentation.
+
+Compares bare and ``@timed`` coroutines, and the latency of a trivial
+endpoint with and without the request-metrics middleware. Run with
+``METRICS_ENABLED=false`` to confirm the decorators become no-ops.
+
+Usage (from ``backend/``):
+    python -m benchmarks.metrics_overhead --iterations 100000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+for _key, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "PINECONE_API_KEY": "benchmark",
+    "PINECONE_ENVIRONMENT": "local",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import RequestMetricsMiddleware, timed  # noqa: E402
+from benchmarks.search_latency import summarize  # noqa: E402
+
+
+async def bare():
+    return None
+
+
+instrumented = timed("benchmark.noop")(bare)
+
+
+async def per_call_ns(func, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def health_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    if with_middleware:
+        app.add_middleware(RequestMetricsMiddleware)
+    return app
+
+
+async def request_latencies(app: FastAPI, requests: int) -> list:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get("/health")
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def main(args):
+    # Warm up both paths before measuring
+    await per_call_ns(bare, 1000)
+    await per_call_ns(instrumented, 1000)
+    bare_ns = await per_call_ns(bare, args.iterations)
+    timed_ns = await per_call_ns(instrumented, args.iterations)
+
+    result = {
+        "metrics_enabled": settings.METRICS_ENABLED,
+        "decorator": {
+            "iterations": args.iterations,
+            "bare_ns": round(bare_ns, 1),
+            "timed_ns": round(timed_ns, 1),
+            "overhead_ns": round(timed_ns - bare_ns, 1),
+        },
+    }
+
+    if settings.METRICS_ENABLED:
+        plain = summarize(await request_latencies(health_app(False), args.requests))
+        measured = summarize(await request_latencies(health_app(True), args.requests))
+        result["middleware"] = {
+            "without": plain,
+            "with": measured,
+            "p50_overhead_ms": round(measured["p50_ms"] - plain["p50_ms"], 3),
+        }
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
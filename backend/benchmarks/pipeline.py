@@ -0,0 +1,217 @@
+"""
+End-to-end throughput and latency of the main API routes, fully offline.
+
+OpenAI, the Pinecone index and the Motor client are replaced by local fakes
+(``app.services.offline``, ``benchmarks.fakes``) with configurable latency.
+A deterministic corpus is ingested first, then each scenario is driven at
+every concurrency level. Results are printed as JSON so runs can be diffed
+between commits.
+
+Scenarios: ingest (POST /documents/ingest), search (POST /documents/search),
+swot (POST /analyze/swot), trends (POST /analyze/trends). Analysis requests
+are all distinct, so the analysis cache and request coalescing never hit.
+
+Requires mongomock-motor. tiktoken needs its encodings cached locally.
+
+Usage (from ``backend/``):
+    python -m benchmarks.pipeline --corpus 1000 --concurrency 1 8 32 --requests 200
+"""
+
+from collections import Counter
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+for _key, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "PINECONE_API_KEY": "benchmark",
+    "PINECONE_ENVIRONMENT": "local",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+    "VECTOR_BACKEND": "pinecone",
+    # Measure the pipeline, not the quota scheduler
+    "OPENAI_CHAT_RPM": "100000000",
+    "OPENAI_CHAT_TPM": "100000000000",
+    "OPENAI_EMBEDDING_RPM": "100000000",
+    "OPENAI_EMBEDDING_TPM": "100000000000",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx  # noqa: E402
+
+import app.core.database as database  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.ingestion_service import ingestion_service  # noqa: E402
+from app.services.llm_service import llm_service  # noqa: E402
+from app.services.offline import OfflineOpenAI  # noqa: E402
+from app.services.vector_service import vector_service  # noqa: E402
+from benchmarks.fakes import FakePineconeIndex, fake_motor_client  # noqa: E402
+from benchmarks.search_latency import summarize  # noqa: E402
+
+SCENARIOS = ("ingest", "search", "swot", "trends")
+INDUSTRIES = ("clean_tech", "automotive", "energy", "fintech", "healthcare")
+CATEGORIES = ("news", "report", "analysis")
+VOCABULARY = (
+    "battery", "solar", "grid", "storage", "charging", "hydrogen", "policy",
+    "investment", "demand", "supply", "margin", "growth", "regulation",
+    "adoption", "pricing", "capacity", "market", "share", "competition", "cost",
+)
+
+
+class Corpus:
+    """Deterministic document generator."""
+
+    def __init__(self, seed: int, words: int):
+        self.random = random.Random(seed)
+        self.words = words
+        self.counter = itertools.count()
+
+    def document(self) -> dict:
+        n = next(self.counter)
+        return {
+            "title": f"Benchmark document {n}",
+            "content": " ".join(self.random.choice(VOCABULARY) for _ in range(self.words)),
+            "source": "benchmark",
+            "url": f"https://benchmark.local/{n}",
+            "category": self.random.choice(CATEGORIES),
+            "industry": self.random.choice(INDUSTRIES),
+            "metadata": {},
+        }
+
+    def query(self) -> str:
+        return " ".join(self.random.choice(VOCABULARY) for _ in range(4))
+
+
+def scenario_request(name: str, corpus: Corpus, counter: itertools.count):
+    n = next(counter)
+    industry = corpus.random.choice(INDUSTRIES)
+    if name == "ingest":
+        return "POST", "/api/documents/ingest", {"json": corpus.document()}
+    if name == "search":
+        return "POST", "/api/documents/search", {
+            "params": {"query": corpus.query(), "industry": industry, "top_k": 5}
+        }
+    if name == "swot":
+        return "POST", "/api/analyze/swot", {
+            "json": {"company_name": f"Company {n}", "industry": industry}
+        }
+    return "POST", "/api/analyze/trends", {
+        "json": {"industry": industry, "time_period": f"period {n}"}
+    }
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    name: str,
+    corpus: Corpus,
+    concurrency: int,
+    total: int
+) -> dict:
+    latencies = []
+    errors = 0
+    remaining = total
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = scenario_request(name, corpus, counter)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 2),
+        "errors": errors,
+        "latency": summarize(latencies),
+    }
+
+
+async def main(args):
+    # Swap every external dependency for a local fake
+    database.AsyncIOMotorClient = fake_motor_client
+    with contextlib.redirect_stdout(sys.stderr):  # Keep stdout pure JSON
+        await database.connect_to_mongo()
+    llm_service.client = OfflineOpenAI(
+        settings.EMBEDDING_DIMENSION,
+        latency=args.embedding_latency,
+        chat_latency=args.chat_latency
+    )
+    vector_service.store.index = FakePineconeIndex(
+        settings.EMBEDDING_DIMENSION, latency=args.vector_latency
+    )
+
+    corpus = Corpus(args.seed, args.words)
+
+    # Seed the corpus through the bulk ingestion path
+    started = time.perf_counter()
+    failed = []
+    for start in range(0, args.corpus, settings.INGEST_BATCH_SIZE):
+        batch = [corpus.document() for _ in range(min(settings.INGEST_BATCH_SIZE, args.corpus - start))]
+        statuses = await ingestion_service.ingest_documents(batch)
+        failed.extend(status for status in statuses if status["status"] == "failed")
+    seed_seconds = time.perf_counter() - started
+    if failed:
+        # Measuring a partial corpus would only report the setup's errors
+        errors = Counter(status["error"] for status in failed)
+        for error, count in errors.most_common(5):
+            print(f"❌ {count} seed documents failed: {error}", file=sys.stderr)
+        sys.exit(f"{len(failed)} of {args.corpus} seed documents failed to ingest")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        results = {
+            name: [
+                await run_level(client, name, corpus, concurrency, args.requests)
+                for concurrency in args.concurrency
+            ]
+            for name in args.scenarios
+        }
+
+    vector_service.close()
+    print(json.dumps({
+        "config": {
+            "corpus": args.corpus,
+            "words_per_document": args.words,
+            "requests_per_level": args.requests,
+            "embedding_latency_ms": args.embedding_latency * 1000,
+            "chat_latency_ms": args.chat_latency * 1000,
+            "vector_latency_ms": args.vector_latency * 1000,
+            "seed": args.seed,
+        },
+        "seed_corpus": {
+            "seconds": round(seed_seconds, 3),
+            "docs_per_second": round(args.corpus / seed_seconds, 2) if seed_seconds else None,
+        },
+        "scenarios": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=int, default=1000, help="documents ingested before measuring")
+    parser.add_argument("--words", type=int, default=300, help="words per generated document")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--embedding-latency", type=float, default=0.02)
+    parser.add_argument("--chat-latency", type=float, default=0.5)
+    parser.add_argument("--vector-latency", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
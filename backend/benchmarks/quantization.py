@@ -0,0 +1,201 @@
+"""
+Recall versus size for the embedding quantization options, fully offline.
+
+A synthetic clustered corpus stands in for ada-002 embeddings. Every variant
+is built through the code the app runs: ``FaissVectorStore`` for the local
+index options and ``EmbeddingCache`` for int8 cache entries. Memory size is
+what search keeps resident: the cache entry, the checkpointed FAISS index,
+or for plain flat search the memory-mapped vectors file. Stores also
+report their total disk size, which always includes the float32 vectors
+file, so quantization shrinks memory but adds to disk. Index variants the
+corpus is too small to train are flagged ``"trained": false``; their
+numbers describe exact search, not the quantized index. Recall@k is
+measured against exact float32 search; a Python list of floats is
+reported for scale. Results are printed as JSON so runs can be diffed between commits.
+
+Usage (from ``backend/``):
+    python -m benchmarks.quantization --vectors 20000 --dimension 1536 --pq-m 96 192
+"""
+
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+for _key, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "PINECONE_API_KEY": "benchmark",
+    "PINECONE_ENVIRONMENT": "local",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.services.embedding_cache import EmbeddingCache  # noqa: E402
+from app.services.faiss_store import FaissVectorStore  # noqa: E402
+from benchmarks.search_latency import summarize  # noqa: E402
+
+
+def basis(rng: np.random.Generator, args) -> tuple:
+    """Topic centers and a shared low-rank subspace for ``corpus``."""
+    centers = rng.standard_normal((args.clusters, args.dimension)).astype(np.float32)
+    # Unit variance per dimension, like the centers
+    subspace = rng.standard_normal((args.rank, args.dimension)).astype(np.float32) / np.sqrt(args.rank)
+    return centers, subspace
+
+
+def corpus(rng: np.random.Generator, count: int, centers: np.ndarray, subspace: np.ndarray, spread: float) -> np.ndarray:
+    """Unit vectors around topic centers that vary mostly within a low-rank subspace.
+
+    Real embeddings have a far lower intrinsic dimension than 1536; isotropic
+    noise would make every neighbour nearly equidistant.
+    """
+    latent = rng.standard_normal((count, len(subspace))).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)] + spread * latent @ subspace
+    vectors += 0.1 * rng.standard_normal(vectors.shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def recall(found, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(hits) & set(expected)) / k for hits, expected in zip(found, truth)]))
+
+
+def list_bytes(dimension: int) -> int:
+    """Size of one embedding as a list of Python floats."""
+    values = np.random.default_rng(0).standard_normal(dimension).tolist()
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+
+def bench_store(vectors, queries, truth, k, path: str, **options) -> dict:
+    store = FaissVectorStore(vectors.shape[1], path=path, **options)
+    store.initialize()
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), 5000):
+        store.upsert([
+            {"id": str(offset + row), "values": values, "metadata": {}}
+            for row, values in enumerate(vectors[offset:offset + 5000])
+        ])
+    build = time.perf_counter() - start
+    store.save()
+
+    latencies, found = [], []
+    for query in queries:
+        start = time.perf_counter()
+        matches = store.query(query, k)
+        latencies.append(time.perf_counter() - start)
+        found.append([int(match["id"]) for match in matches])
+
+    trained = store.index is None or store.index.is_trained
+    store.close()
+    if not trained:
+        print(
+            f"⚠️  {os.path.basename(path)} needs {store._train_size} vectors to train; "
+            "its numbers are for exact search", file=sys.stderr
+        )
+
+    resident = glob.glob(f"{path}.*.index") or glob.glob(f"{path}.*.vectors")
+    disk = glob.glob(f"{path}.*")
+    return {
+        "variant": os.path.basename(path),
+        "trained": trained,
+        "memory_bytes_per_vector": round(sum(map(os.path.getsize, resident)) / len(vectors), 1),
+        "disk_bytes_per_vector": round(sum(map(os.path.getsize, disk)) / len(vectors), 1),
+        "recall": round(recall(found, truth), 4),
+        "build_seconds": round(build, 2),
+        "query": summarize(latencies),
+    }
+
+
+def bench_cache(vectors, queries, truth, k) -> dict:
+    cache = EmbeddingCache(max_entries=len(vectors), quantization="int8")
+    keys = [str(row) for row in range(len(vectors))]
+    start = time.perf_counter()
+    asyncio.run(cache.put_many(dict(zip(keys, vectors))))
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    found_vectors = asyncio.run(cache.get_many(keys))
+    read = time.perf_counter() - start
+
+    restored = np.stack([found_vectors[key] for key in keys])
+    return {
+        "variant": "cache-int8",
+        "memory_bytes_per_vector": round(cache.stats()["memory_bytes"] / len(vectors), 1),
+        "recall": round(recall(exact_top_k(restored, queries, k), truth), 4),
+        "min_cosine": round(float(np.min(np.sum(restored * vectors, axis=1))), 5),
+        "build_seconds": round(build, 2),
+        "read_seconds": round(read, 2),
+    }
+
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    centers, subspace = basis(rng, args)
+    vectors = corpus(rng, args.vectors, centers, subspace, args.spread)
+    queries = corpus(rng, args.queries, centers, subspace, args.spread)
+    truth = exact_top_k(vectors, queries, args.top_k)
+
+    ivf = {"index_type": "ivf", "nlist": args.nlist, "nprobe": args.nprobe}
+    variants = {
+        "flat": {"index_type": "flat"},
+        "flat-sq8": {"index_type": "flat", "quantization": "sq8"},
+        "hnsw-sq8": {"index_type": "hnsw", "quantization": "sq8"},
+        "ivf": ivf,
+        "ivf-sq8": {**ivf, "quantization": "sq8"},
+        **{f"ivf-pq{m}": {**ivf, "quantization": "pq", "pq_m": m} for m in args.pq_m},
+    }
+
+    results = [bench_cache(vectors, queries, truth, args.top_k)]
+    # Store setup prints status lines; keep stdout pure JSON
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(sys.stderr):
+        for name, options in variants.items():
+            results.append(bench_store(
+                vectors, queries, truth, args.top_k, os.path.join(directory, name), **options
+            ))
+
+    float32 = 4 * args.dimension
+    for result in results:
+        trained = result.get("trained", True)
+        result["memory_compression"] = round(float32 / result["memory_bytes_per_vector"], 1) if trained else None
+        if "disk_bytes_per_vector" in result:
+            result["disk_compression"] = round(float32 / result["disk_bytes_per_vector"], 2)
+
+    print(json.dumps({
+        "vectors": args.vectors,
+        "dimension": args.dimension,
+        "top_k": args.top_k,
+        "nlist": args.nlist,
+        "nprobe": args.nprobe,
+        "python_list_bytes_per_vector": list_bytes(args.dimension),
+        "float32_bytes_per_vector": float32,
+        "variants": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=200, help="topics the corpus is drawn around")
+    parser.add_argument("--rank", type=int, default=64, help="dimension of the within-topic variation")
+    parser.add_argument("--spread", type=float, default=0.5, help="within-topic variation")
+    parser.add_argument("--nlist", type=int, default=100)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--pq-m", type=int, nargs="+", default=[96, 192], help="PQ bytes per vector to try")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
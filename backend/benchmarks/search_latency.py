@@ -0,0 +1,153 @@
+"""
+Latency benchmark for POST /api/documents/search under concurrent load.
+
+The vector store is replaced by a stand-in whose ``query`` blocks the
+calling thread (like the real synchronous client) and the embedding call by
+an async sleep, so no external services are needed. While searches are in
+flight, ``/health`` is probed continuously; if vector calls blocked the event
+loop its latency would grow with the search latency.
+
+Usage (from ``backend/``):
+    python -m benchmarks.search_latency --concurrency 1 8 32 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import numpy as np
+
+for _key, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "PINECONE_API_KEY": "benchmark",
+    "PINECONE_ENVIRONMENT": "local",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.llm_service import llm_service  # noqa: E402
+from app.services.rate_limiter import Priority  # noqa: E402
+from app.services.vector_service import vector_service  # noqa: E402
+from app.services.vector_store import VectorStore  # noqa: E402
+
+
+class BlockingStore(VectorStore):
+    """Vector store stand-in whose calls block like the Pinecone client."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def initialize(self):
+        pass
+
+    def upsert(self, vectors):
+        time.sleep(self.latency)
+
+    def query(self, vector, top_k, filter=None):
+        time.sleep(self.latency)
+        return [
+            {"id": f"vec-{i}", "score": 1.0 - i / 100, "metadata": {"doc_id": str(i)}}
+            for i in range(top_k)
+        ]
+
+    def fetch(self, ids):
+        time.sleep(self.latency)
+        return []
+
+    def delete(self, ids):
+        time.sleep(self.latency)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples) -> dict:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+    }
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, total: int) -> dict:
+    search_latencies = []
+    health_latencies = []
+    remaining = total
+    done = asyncio.Event()
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/documents/search", params={"query": "battery technology", "top_k": 5}
+            )
+            response.raise_for_status()
+            search_latencies.append(time.perf_counter() - start)
+
+    async def prober():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            health_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    probe_task = asyncio.create_task(prober())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 2),
+        "search": summarize(search_latencies),
+        "health": summarize(health_latencies),
+    }
+
+
+async def main(args):
+    async def fake_embedding(text: str, priority: Priority = Priority.INTERACTIVE):
+        await asyncio.sleep(args.embedding_latency)
+        return np.zeros(1536, dtype=np.float32)
+
+    llm_service.generate_embedding = fake_embedding
+    vector_service.store = BlockingStore(args.query_latency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results = [
+            await run_level(client, concurrency, args.requests)
+            for concurrency in args.concurrency
+        ]
+
+    vector_service._executor.shutdown()
+    print(json.dumps({
+        "vector_max_concurrency": vector_service._executor._max_workers,
+        "query_latency_ms": args.query_latency * 1000,
+        "levels": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--query-latency", type=float, default=0.02)
+    parser.add_argument("--embedding-latency", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""
+Cold-start cost of the API: import time and time until requests are served.
+
+Each run starts a fresh interpreter that imports ``app.main``, enters the
+application lifespan and requests ``/health`` and ``/ready``. Dependencies
+are whatever the environment points at; unreachable ones show that startup
+no longer waits for them. One extra run under ``-X importtime`` lists the
+slowest imports.
+
+Usage (from ``backend/``):
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+for _key, _value in {
+    "OPENAI_API_KEY": "sk-benchmark",
+    "PINECONE_API_KEY": "benchmark",
+    "PINECONE_ENVIRONMENT": "local",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "benchmark",
+    "SECRET_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(spawned_at: float):
+    """Runs in the fresh interpreter; prints one JSON line of timings."""
+    import asyncio
+    import httpx
+
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    async def serve():
+        async with app.router.lifespan_context(app):
+            started = time.perf_counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                health = await client.get("/health")
+                served = time.perf_counter()
+                serving_at = time.time()
+                ready = await client.get("/ready")
+        return started, served, serving_at, health.status_code, ready.json()
+
+    started, served, serving_at, health_status, ready = asyncio.run(serve())
+    print(json.dumps({
+        "import_seconds": imported - start,
+        "lifespan_startup_seconds": started - imported,
+        "first_request_seconds": served - started,
+        "time_to_serve_seconds": serving_at - spawned_at,
+        "health_status": health_status,
+        "ready": ready
+    }))
+
+
+def spawn(extra_args=()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, "-m", "benchmarks.startup", "--child", str(time.time())],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def slowest_imports(stderr: str, count: int) -> list:
+    """Parse ``-X importtime`` output into the modules with the largest cumulative time."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.strip()))
+    return [
+        {"module": name, "cumulative_ms": round(micros / 1000, 1)}
+        for micros, name in sorted(modules, reverse=True)[:count]
+    ]
+
+
+def describe(values: list) -> dict:
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4)
+    }
+
+
+def main(args):
+    runs = [json.loads(spawn().stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+    profile = spawn(["-X", "importtime"])
+
+    print(json.dumps({
+        "runs": args.runs,
+        "time_to_serve_seconds": describe([run["time_to_serve_seconds"] for run in runs]),
+        "import_seconds": describe([run["import_seconds"] for run in runs]),
+        "lifespan_startup_seconds": describe([run["lifespan_startup_seconds"] for run in runs]),
+        "first_request_seconds": describe([run["first_request_seconds"] for run in runs]),
+        "health_status": runs[-1]["health_status"],
+        "ready_at_first_request": runs[-1]["ready"],
+        "slowest_imports": slowest_imports(profile.stderr, args.top_imports)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top-imports", type=int, default=15)
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        child(args.child)
+    else:
+        main(args)
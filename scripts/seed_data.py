@@ -1,15 +1,27 @@
 """
-Sample data seeder for AI Market Intelligence Dashboard
-Run this to populate the database with sample documents for testing
+Sample data seeder and backfill tool for AI Market Intelligence Dashboard
+
+Without arguments, seeds the database with sample documents for testing.
+Given JSONL or CSV files, streams them through the ingestion pipeline:
+
+    python ../scripts/seed_data.py archive/*.jsonl --concurrency 8 --batch-size 200
+
+Documents are upserted by (source, url), so re-running is cheap. Progress is
+checkpointed per file; a crashed run resumes where it stopped. Pass
+``--offline`` to embed with a deterministic local stand-in and store vectors
+in FAISS, with no OpenAI or Pinecone calls.
 """
 
+import argparse
 import asyncio
+import csv
+import json
+import os
 import sys
-sys.path.append('./backend')
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from app.models.document import Document
-from app.services.vector_service import vector_service
-from app.core.database import connect_to_mongo, close_mongo_connection
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
 
 
 SAMPLE_DOCUMENTS = [
@@ -25,6 +37,7 @@ SAMPLE_DOCUMENTS = [
         "title": "Clean Energy Investment Surge in Q1 2024",
         "content": "Global clean energy investments reached $150 billion in Q1 2024, a 40% increase from the previous year. Solar and wind projects dominated, with emerging markets showing strong growth.",
         "source": "Energy Market Report",
+        "url": "https://example.com/clean-energy-q1-2024",
         "category": "report",
         "industry": "clean_tech",
     },
@@ -32,6 +45,7 @@ SAMPLE_DOCUMENTS = [
         "title": "AI Integration in Renewable Energy Management",
         "content": "Artificial intelligence is revolutionizing renewable energy management. Smart grids powered by AI can predict energy demand, optimize distribution, and reduce waste by up to 25%.",
         "source": "AI Energy Journal",
+        "url": "https://example.com/ai-renewable-management",
         "category": "analysis",
         "industry": "clean_tech",
     },
@@ -39,6 +53,7 @@ SAMPLE_DOCUMENTS = [
         "title": "Electric Vehicle Market Share Reaches 18%",
         "content": "Electric vehicles now account for 18% of global car sales, up from 12% last year. China leads adoption, followed by Europe and North America.",
         "source": "Automotive Insights",
+        "url": "https://example.com/ev-market-share",
         "category": "news",
         "industry": "automotive",
     },
@@ -46,46 +61,255 @@ SAMPLE_DOCUMENTS = [
         "title": "Green Hydrogen Production Costs Drop 30%",
         "content": "Green hydrogen production costs have decreased by 30% due to improved electrolysis technology and cheaper renewable electricity. This makes hydrogen a viable alternative for heavy industry decarbonization.",
         "source": "Energy Transition Report",
+        "url": "https://example.com/green-hydrogen-costs",
         "category": "report",
         "industry": "clean_tech",
     },
 ]
 
+DOCUMENT_FIELDS = ("title", "content", "source", "url", "category", "industry")
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """Stream raw records from a JSONL or CSV file.
+
+    CSV columns other than the document fields are collected into ``metadata``.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                record = {field: row.pop(field) for field in DOCUMENT_FIELDS if field in row}
+                record["url"] = record.get("url") or None
+                record["metadata"] = {key: value for key, value in row.items() if key}
+                yield record
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+
+
+class Checkpoint:
+    """Per-file count of records fully processed, saved atomically as JSON."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.offsets: Dict[str, int] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.offsets = json.load(f)
+
+    def offset(self, source: str) -> int:
+        return self.offsets.get(source, 0)
+
+    def advance(self, source: str, offset: int):
+        self.offsets[source] = offset
+        if self.path:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.offsets, f)
+            os.replace(tmp, self.path)
+
+
+class Progress:
+    """Running totals and throughput."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.docs = 0
+        self.tokens = 0
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, results: List[Dict], tokens: int):
+        self.docs += len(results)
+        self.tokens += tokens
+        for result in results:
+            self.statuses[result["status"]] = self.statuses.get(result["status"], 0) + 1
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        statuses = ", ".join(f"{count} {status}" for status, count in sorted(self.statuses.items()))
+        return (
+            f"📈 {self.docs} docs ({statuses or 'none yet'}) in {elapsed:.1f}s | "
+            f"{self.docs / elapsed:.1f} docs/s | {self.tokens / elapsed:.0f} tokens/s"
+        )
+
+
+class Backfill:
+    """Concurrent, checkpointed ingestion of record streams."""
+
+    def __init__(self, args: argparse.Namespace):
+        from app.services.ingestion_service import ingestion_service
+
+        self.ingestion_service = ingestion_service
+        self.args = args
+        self.checkpoint = Checkpoint(args.checkpoint or None)
+        if args.restart:
+            self.checkpoint.offsets = {}
+        self.progress = Progress()
+        self.failed_path = f"{args.checkpoint}.failed.jsonl" if args.checkpoint else None
+
+    async def run(self, sources: List[Tuple[str, Iterator[Dict]]]):
+        for source, records in sources:
+            await self._run_source(source, records)
+
+    async def _run_source(self, source: str, records: Iterator[Dict]):
+        start = self.checkpoint.offset(source)
+        if start:
+            print(f"⏩ {source}: resuming after {start} records")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.args.concurrency * 2)
+        completed: Dict[int, int] = {}  # batch start -> batch end
+        committed = start
+
+        async def worker():
+            nonlocal committed
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                first, items = batch
+                await self._ingest(items)
+
+                # Only advance past batches whose predecessors are done too
+                completed[first] = first + len(items)
+                while committed in completed:
+                    committed = completed.pop(committed)
+                self.checkpoint.advance(source, committed)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.args.concurrency)]
+        batch: List[Dict] = []
+        first = start
+        for position, record in enumerate(records):
+            if position < start:
+                continue
+            batch.append(record)
+            if len(batch) >= self.args.batch_size:
+                # Blocks while the queue is full, so memory stays bounded
+                await queue.put((first, batch))
+                first, batch = position + 1, []
+        if batch:
+            await queue.put((first, batch))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def _ingest(self, records: List[Dict]):
+        from pydantic import ValidationError
+        from app.api.documents import DocumentCreate
+        from app.core.config import settings
+        from app.services.chunking import count_tokens
+
+        outcomes: List[Tuple[Dict, Dict]] = []  # (record, result)
+        valid: List[Tuple[Dict, Dict]] = []  # (record, validated item)
+        for record in records:
+            try:
+                valid.append((record, DocumentCreate.model_validate(record).model_dump()))
+            except ValidationError as e:
+                title = record.get("title") if isinstance(record, dict) else None
+                outcomes.append((record, {"title": title, "status": "failed", "error": str(e)}))
+
+        items = [item for _, item in valid]
+        tokens = await asyncio.to_thread(
+            lambda: sum(count_tokens(item["content"], settings.EMBEDDING_MODEL) for item in items)
+        )
+        try:
+            results = await self.ingestion_service.ingest_documents(items, upsert=self.args.upsert)
+        except Exception as e:
+            results = [{"title": item["title"], "status": "failed", "error": str(e)} for item in items]
+        outcomes += [(record, result) for (record, _), result in zip(valid, results)]
+
+        failed = [(record, result) for record, result in outcomes if result["status"] == "failed"]
+        if failed:
+            self._record_failures(failed)
+        self.progress.record([result for _, result in outcomes], tokens)
+
+    def _record_failures(self, failed: List[Tuple[Dict, Dict]]):
+        for _, result in failed[:3]:
+            print(f"❌ Failed: {result['title']}: {result['error']}")
+        if self.failed_path:
+            # Failed records can be fed back in once the cause is fixed
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                for record, _ in failed:
+                    f.write(json.dumps(record) + "\n")
+
+
+async def report(progress: Progress, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        print(progress.line())
+
+
+def use_offline_backends():
+    """Point the app at local stand-ins before its services are imported."""
+    os.environ["VECTOR_BACKEND"] = "faiss"
+    for key, value in {
+        "OPENAI_API_KEY": "sk-offline",
+        "OPENAI_EMBEDDING_RPM": "1000000000",
+        "OPENAI_EMBEDDING_TPM": "1000000000",
+        "SECRET_KEY": "offline",
+    }.items():
+        os.environ.setdefault(key, value)
+
+
+async def seed_documents(args: argparse.Namespace):
+    """Seed the database with sample documents or backfill from files."""
+
+    if args.offline:
+        use_offline_backends()
+
+    from app.core.config import settings
+    from app.core.database import connect_to_mongo, close_mongo_connection
+    from app.services.llm_service import llm_service
+    from app.services.vector_service import vector_service
+
+    if args.offline:
+        from app.services.offline import OfflineOpenAI
+        llm_service.client = OfflineOpenAI(settings.EMBEDDING_DIMENSION)
+
+    print("🌱 Seeding database" + (" (offline)" if args.offline else "") + "...")
 
-async def seed_documents():
-    """Seed the database with sample documents."""
-    
-    print("🌱 Seeding database with sample documents...")
-    
     await connect_to_mongo()
     await vector_service.initialize()
-    
-    for doc_data in SAMPLE_DOCUMENTS:
-        # Create document
-        document = Document(**doc_data)
-        await document.insert()
-        
-        # Create vector embedding
-        vector_id = await vector_service.upsert_document(
-            doc_id=str(document.id),
-            content=doc_data["content"],
-            metadata={
-                "title": doc_data["title"],
-                "source": doc_data["source"],
-                "category": doc_data["category"],
-                "industry": doc_data["industry"]
-            }
-        )
-        
-        # Update document with embedding ID
-        document.embedding_id = vector_id
-        await document.save()
-        
-        print(f"✅ Created: {doc_data['title']}")
-    
-    await close_mongo_connection()
+
+    if args.files:
+        sources = [(os.path.abspath(path), iter_records(path)) for path in args.files]
+    else:
+        sources = [("samples", iter(SAMPLE_DOCUMENTS))]
+        args.checkpoint = ""  # Samples are cheap to upsert again
+
+    backfill = Backfill(args)
+    reporter = asyncio.create_task(report(backfill.progress, args.progress_interval))
+    try:
+        await backfill.run(sources)
+    finally:
+        reporter.cancel()
+        print(backfill.progress.line())
+        await close_mongo_connection()
+        vector_service.close()
+
     print("🎉 Seeding complete!")
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="JSONL or CSV files (default: built-in samples)")
+    parser.add_argument("--concurrency", type=int, default=4, help="batches ingested at once")
+    parser.add_argument("--batch-size", type=int, default=100, help="documents per ingestion batch")
+    parser.add_argument("--checkpoint", default="seed_checkpoint.json", help="progress file ('' disables)")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress")
+    parser.add_argument("--no-upsert", dest="upsert", action="store_false", help="always insert new documents")
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="use local embedding and FAISS stand-ins (set FAISS_INDEX_PATH to keep the index)"
+    )
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="seconds between progress lines")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    asyncio.run(seed_documents())
+    asyncio.run(seed_documents(parse_args()))
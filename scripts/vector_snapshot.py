@@ -0,0 +1,65 @@
+"""
+Snapshot and restore the vector store without re-embedding anything.
+
+    python ../scripts/vector_snapshot.py export snapshots/2024-06-01
+    python ../scripts/vector_snapshot.py import snapshots/2024-06-01
+
+``export`` reads every vector referenced by a stored document from the
+configured backend into a directory holding a float32 matrix (memory-mapped
+on import), a row-aligned JSONL metadata table and a manifest. ``import``
+upserts a snapshot into whatever ``VECTOR_BACKEND`` points at, so the same
+files rebuild a Pinecone index, move it to another region, or seed a local
+FAISS index (``VECTOR_BACKEND=faiss FAISS_INDEX_PATH=...``).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+
+async def run(args: argparse.Namespace):
+    from app.core.database import connect_to_mongo, close_mongo_connection
+    from app.services.vector_service import vector_service
+    from app.services.vector_snapshot import export_snapshot, import_snapshot
+
+    start = time.perf_counter()
+    await vector_service.initialize()
+    try:
+        if args.command == "export":
+            # Vector IDs are listed from MongoDB
+            await connect_to_mongo()
+            try:
+                manifest = await export_snapshot(args.path, args.batch_size or 1000)
+            finally:
+                await close_mongo_connection()
+            print(f"📦 Exported {manifest['count']} vectors to {args.path}")
+            if manifest["missing"]:
+                print(f"⚠️ {manifest['missing']} vectors referenced by documents were not in the store")
+        else:
+            restored, manifest = await import_snapshot(args.path, args.batch_size or 5000)
+            print(f"📥 Imported {restored} vectors from {args.path}")
+    finally:
+        vector_service.close()
+
+    print(json.dumps({**manifest, "seconds": round(time.perf_counter() - start, 2)}, indent=2))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="snapshot directory")
+    parser.add_argument(
+        "--batch-size", type=int,
+        help="vectors per step (default: 1000 fetched per export step, 5000 upserted per import step)"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))